@@ -0,0 +1,19 @@
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.parallel_tree.builder import build_parallel_tree, get_parallel_passes
+from expression_parser.parallel_tree.pass_manager import PassManager
+from .scanner_benchmark import generate_expression
+
+
+EXPRESSION_TERMS = 5000
+
+
+if __name__ == '__main__':
+  expressions = dict(
+    random=generate_expression(EXPRESSION_TERMS),
+    chain=' + '.join(f'x{i} * 1 - 0' for i in range(EXPRESSION_TERMS)),
+  )
+  for name, expression in expressions.items():
+    print(f'{name}: {len(expression)} chars')
+    manager = PassManager(get_parallel_passes(), callback=lambda stats: print('  ' + stats.format_params()))
+    build_parallel_tree(parse(expression), manager=manager)
+    print('  total: %.4f seconds' % sum(s.seconds for s in manager.get_stats()))
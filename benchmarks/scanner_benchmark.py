@@ -0,0 +1,43 @@
+import random
+from timeit import timeit
+from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.parser.expression_scanner import ExpressionScanner
+
+
+EXPRESSION_TERMS = 5000
+BATCH_SIZE = 20000
+REPEATS = 5
+
+
+def generate_expression(terms: int, seed: int = 0) -> str:
+  rnd = random.Random(seed)
+  operands = ('alpha', 'beta_2', 'x', '42', '3.1415', 'sin(y)', 'max(a, 7.5)', '(b - c)')
+  operators = ('+', '-', '*', '/', '^')
+  parts = [rnd.choice(operands)]
+  for _ in range(terms - 1):
+    parts.append(rnd.choice(operators))
+    parts.append(rnd.choice(operands))
+  return ' '.join(parts)
+
+
+def measure(parser: type, expression: str, repeats: int = REPEATS) -> float:
+  seconds = timeit(lambda: parser(expression), number=repeats)
+  return len(expression) * repeats / seconds
+
+
+def measure_batch(expressions: list[str], repeats: int = REPEATS) -> tuple[float, float]:
+  single = timeit(lambda: [ExpressionParser(e) for e in expressions], number=repeats)
+  batch = timeit(lambda: tuple(ExpressionParser.parse_many(expressions)), number=repeats)
+  count = len(expressions) * repeats
+  return count / single, count / batch
+
+
+if __name__ == '__main__':
+  expression = generate_expression(EXPRESSION_TERMS)
+  print(f'Expression length: {len(expression)} chars')
+  for parser in (ExpressionParser, ExpressionScanner):
+    print('%s: %.0f chars/sec' % (parser.__name__, measure(parser, expression)))
+  formulas = [generate_expression(3, seed) for seed in range(BATCH_SIZE)]
+  single, batch = measure_batch(formulas)
+  print('ExpressionParser per expression: %.0f expressions/sec' % single)
+  print('ExpressionParser.parse_many: %.0f expressions/sec' % batch)
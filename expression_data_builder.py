@@ -1,10 +1,12 @@
 from typing import Callable
 from expression_parser.parser.expression_parser import ExpressionParser, ParsingExeprion, Token
 from expression_parser.analyzer.syntax_analyzer import SyntaxAnalyzer, SyntaxAnalysisException, Node, NodesTuple
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.analyzer.dag_builder import build_dag
+from expression_parser.analyzer.fingerprint import StructuralKey, FingerprintCache, get_unique_forms
 from expression_parser.parallel_tree.builder import build_parallel_tree
 from expression_parser.parallel_tree.optimizer_tools import open_brackets
 from expression_parser.tree_output.expression_view import ExpressionView
-from expression_parser.tree_output.str_converter import stringify_tree
 from expression_parser.equivalent_forms.distributivity import generate_distributivity_forms
 from expression_parser.equivalent_forms.commutativity import generate_commutativity_forms
 from expression_parser.conveyor_simulation.dynamic import DynamicConveyor, SimulationData
@@ -20,9 +22,11 @@ class ExpressionDataBuilder:
       parser(*args)
     except ExceptionGroup as eg:
       exceptions = eg.exceptions
-      is_parsing_exceptions = all(isinstance(e, ParsingExeprion) for e in exceptions)
-      if not is_parsing_exceptions: raise
-      self.__output.show_parsing_exceptions(eg.message, exceptions)
+      if all(isinstance(e, ParsingExeprion) for e in exceptions):
+        self.__output.show_parsing_exceptions(eg.message, exceptions)
+      elif all(isinstance(e, SyntaxAnalysisException) for e in exceptions):
+        self.__output.show_syntax_exceptions(eg.message, exceptions)
+      else: raise
     except SyntaxAnalysisException as e:
       self.__output.show_syntax_exception(e)
   
@@ -37,9 +41,21 @@ class ExpressionDataBuilder:
     return tokens
 
 
-  def build_syntax_tree(self, tokens: tuple[Token]) -> Node:
-    sa = SyntaxAnalyzer(tokens)
-    syntax_tree = sa.get_tree()
+  def build_syntax_tree(self, tokens: tuple[Token], recover: bool = False) -> Node:
+    sa = SyntaxAnalyzer(tokens, recover)
+    return self.__process_syntax_tree(sa.get_tree())
+
+
+  def parse_syntax_tree(self, expression: str, show_tokens: bool = True, recover: bool = False) -> Node:
+    tokens: list[Token] = list()
+    try:
+      syntax_tree = parse(expression, tokens.append if show_tokens else None, recover=recover)
+    finally:
+      if show_tokens: self.__output.show_tokens(tokens)
+    return self.__process_syntax_tree(syntax_tree)
+
+
+  def __process_syntax_tree(self, syntax_tree: Node) -> Node:
     self.__output.show_syntax_tree(syntax_tree)
     parallel_tree = build_parallel_tree(syntax_tree)
     self.__output.show_parallel_tree(parallel_tree)
@@ -57,12 +73,13 @@ class ExpressionDataBuilder:
 
 
   def build_conveyor_simulations(self, default: Node, distributive: NodesTuple, commutative: NodesTuple):
-    default_results = self.__apply_simulation((default,), '')
+    cache = FingerprintCache()
+    default_results = self.__apply_simulation((default,), None, cache)
     self.__output.log_dafault_conveyor_data(default_results[0][1])
     factor = 'efficiency'
-    default_str = stringify_tree(default)
-    distributive_results = self.__apply_simulation(distributive, default_str)
-    commutative_results = self.__apply_simulation(commutative, default_str)
+    default_key = StructuralKey(default, cache)
+    distributive_results = self.__apply_simulation(distributive, default_key, cache)
+    commutative_results = self.__apply_simulation(commutative, default_key, cache)
     log_node =  lambda data: min(data, key=lambda n: getattr(n[1], factor))
     if distributive_results:
       self.__output.log_distributive_conveyor_data(*log_node(distributive_results))
@@ -71,13 +88,10 @@ class ExpressionDataBuilder:
     self.__output.log_efficiency_table(default_results + distributive_results + commutative_results, factor)
 
 
-  def __apply_simulation(self, expressions: NodesTuple, deafult: str) -> tuple[tuple[Node, SimulationData], ...]:
-    forms = ((n, DynamicConveyor.of(n).simulate()) for n in expressions)
-    return tuple(f for f in forms if stringify_tree(f[0]) != deafult)
+  def __apply_simulation(self, expressions: NodesTuple, deafult: (StructuralKey | None), cache: FingerprintCache) -> tuple[tuple[Node, SimulationData], ...]:
+    forms = (n for n in expressions if StructuralKey(n, cache) != deafult)
+    return tuple((n, DynamicConveyor.of(build_dag(n)).simulate()) for n in forms)
 
 
   def __get_filtered_equivalent_form(self, tree: Node, generator: Callable[[Node], NodesTuple]) -> NodesTuple:
-    default = stringify_tree(tree)
-    forms = ((stringify_tree(n), n) for n in map(build_parallel_tree, generator(tree)))
-    unique = {k: v for k, v in forms if k != default}
-    return tuple(unique.values())
+    return get_unique_forms(map(build_parallel_tree, generator(tree)), tree)
@@ -0,0 +1,39 @@
+from types import NoneType
+from .tree_nodes import Node, UnaryOperatorNode, BinaryOperatorNode, FunctionNode, fold_tree
+from .frozen_nodes import FrozenNode, freeze_node
+
+
+NONDETERMINISTIC_FUNCTIONS: frozenset[str] = frozenset(('rand',))
+
+SharedNode = tuple[(FrozenNode | NoneType), (Node | NoneType)]
+
+
+def build_dag(tree: Node) -> Node:
+  shared: dict[FrozenNode, SharedNode] = dict()
+
+  def share(node: Node, args: tuple[(SharedNode | NoneType), ...]) -> SharedNode:
+    key = __get_key(node, args)
+    if key in shared: return shared[key]
+    rebuilt = (key, __rebuild(node, tuple(a and a[1] for a in args)))
+    if key is not None: shared[key] = rebuilt
+    return rebuilt
+
+  return fold_tree(tree, share)[1]
+
+
+def __get_key(node: Node, args: tuple[(SharedNode | NoneType), ...]) -> (FrozenNode | NoneType):
+  if node.value is None: return None
+  if isinstance(node, FunctionNode) and node.value.value in NONDETERMINISTIC_FUNCTIONS: return None
+  if any(a is not None and a[0] is None for a in args): return None
+  return freeze_node(node, tuple(a and a[0] for a in args))
+
+
+def __rebuild(node: Node, args: tuple[Node, ...]) -> Node:
+  match node:
+    case UnaryOperatorNode():
+      return UnaryOperatorNode(node.value, *args)
+    case BinaryOperatorNode():
+      return BinaryOperatorNode(node.value, *args)
+    case FunctionNode():
+      return FunctionNode(node.value, args)
+  return Node(node.value)
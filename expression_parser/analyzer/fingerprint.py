@@ -0,0 +1,62 @@
+from types import NoneType
+from typing import Iterable
+from .tree_nodes import Node, NodesTuple, get_children, iter_postorder
+from .frozen_nodes import FrozenNode, freeze_node
+
+
+class FingerprintCache:
+  def __init__(self):
+    self.__structures: dict[FrozenNode, int] = dict()
+    self.__frozen: list[FrozenNode] = list()
+    self.__fingerprints: dict[int, int] = {id(None): -1}
+    self.__visited: set[int] = set()
+    self.__nodes: list[Node] = list()
+
+
+  def get_fingerprint(self, tree: (Node | NoneType)) -> int:
+    structures, frozen, fingerprints = self.__structures, self.__frozen, self.__fingerprints
+    for node in iter_postorder(tree, self.__visited):
+      self.__nodes.append(node)
+      args = tuple(frozen[fingerprints[id(c)]] if c is not None else None for c in get_children(node))
+      structure = freeze_node(node, args)
+      if structure not in structures:
+        structures[structure] = len(frozen)
+        frozen.append(structure)
+      fingerprints[id(node)] = structures[structure]
+    return fingerprints[id(tree)]
+
+
+def get_fingerprint(tree: (Node | NoneType), cache: (FingerprintCache | NoneType) = None) -> int:
+  if cache is None: cache = FingerprintCache()
+  return cache.get_fingerprint(tree)
+
+
+def structurally_equal(left: (Node | NoneType), right: (Node | NoneType), cache: (FingerprintCache | NoneType) = None) -> bool:
+  if cache is None: cache = FingerprintCache()
+  return cache.get_fingerprint(left) == cache.get_fingerprint(right)
+
+
+def get_unique_forms(forms: Iterable[Node], default: (Node | NoneType) = None, cache: (FingerprintCache | NoneType) = None) -> NodesTuple:
+  if cache is None: cache = FingerprintCache()
+  excluded = cache.get_fingerprint(default) if default is not None else None
+  unique = {f: n for f, n in ((cache.get_fingerprint(n), n) for n in forms) if f != excluded}
+  return tuple(unique.values())
+
+
+class StructuralKey:
+  __slots__ = ('node', 'fingerprint', '__cache')
+
+  def __init__(self, node: Node, cache: (FingerprintCache | NoneType) = None):
+    self.__cache: FingerprintCache = FingerprintCache() if cache is None else cache
+    self.node: Node = node
+    self.fingerprint: int = self.__cache.get_fingerprint(node)
+
+
+  def __hash__(self) -> int:
+    return self.fingerprint
+
+
+  def __eq__(self, other) -> bool:
+    if not isinstance(other, StructuralKey): return NotImplemented
+    if self.__cache is other.__cache: return self.fingerprint == other.fingerprint
+    return structurally_equal(self.node, other.node)
@@ -0,0 +1,152 @@
+from array import array
+from enum import IntEnum
+from typing import Iterator
+from expression_parser.parser.tokens import Token
+from .tree_nodes import Node, UnaryOperatorNode, BinaryOperatorNode, FunctionNode
+
+
+class Opcode(IntEnum):
+  LEAF = 0
+  UNARY = 1
+  BINARY = 2
+  FUNCTION = 3
+
+
+OPERATIONS: frozenset[Opcode] = frozenset((Opcode.BINARY, Opcode.FUNCTION))
+
+
+class FlatTree:
+  def __init__(self):
+    self.__opcodes: bytearray = bytearray()
+    self.__operands: array = array('l')
+    self.__offsets: array = array('l')
+    self.__tokens: list[Token] = list()
+
+
+  @staticmethod
+  def of(tree: Node):
+    flat = FlatTree()
+    stack: list[tuple[Node, bool]] = [(tree, False)]
+    firsts: list[int] = list()
+    while stack:
+      node, visited = stack.pop()
+      if not visited:
+        firsts.append(len(flat))
+        stack.append((node, True))
+        match node:
+          case UnaryOperatorNode():
+            stack.append((node.expression, False))
+          case BinaryOperatorNode():
+            stack.extend(((node.right, False), (node.left, False)))
+          case FunctionNode():
+            stack.extend((arg, False) for arg in reversed(node.args))
+        continue
+      match node:
+        case UnaryOperatorNode():
+          opcode = Opcode.UNARY
+        case BinaryOperatorNode():
+          opcode = Opcode.BINARY
+        case FunctionNode():
+          opcode = Opcode.FUNCTION
+        case _:
+          opcode = Opcode.LEAF
+      flat.__append(opcode, node.value, firsts.pop())
+    return flat
+
+
+  def to_tree(self) -> Node:
+    built: list[Node] = list()
+    for i in range(len(self)):
+      token = self.get_token(i)
+      match self.__opcodes[i]:
+        case Opcode.UNARY:
+          built.append(UnaryOperatorNode(value=token, expression=built.pop()))
+        case Opcode.BINARY:
+          right = built.pop()
+          built.append(BinaryOperatorNode(value=token, left=built.pop(), right=right))
+        case Opcode.FUNCTION:
+          count = self.get_children_count(i)
+          args = tuple(built[len(built) - count:]) if count else tuple()
+          if count: del built[-count:]
+          built.append(FunctionNode(value=token, args=args))
+        case _:
+          built.append(Node(value=token))
+    return built.pop()
+
+
+  def get_opcode(self, index: int) -> Opcode:
+    return Opcode(self.__opcodes[index])
+
+
+  def get_token(self, index: int) -> (Token | None):
+    operand = self.__operands[index]
+    return self.__tokens[operand] if operand >= 0 else None
+
+
+  def get_offset(self, index: int) -> int:
+    return self.__offsets[index]
+
+
+  def get_children(self, index: int) -> list[int]:
+    children: list[int] = list()
+    child = index - 1
+    while child >= self.__offsets[index]:
+      children.append(child)
+      child = self.__offsets[child] - 1
+    children.reverse()
+    return children
+
+
+  def get_children_count(self, index: int) -> int:
+    count = 0
+    child = index - 1
+    while child >= self.__offsets[index]:
+      count += 1
+      child = self.__offsets[child] - 1
+    return count
+
+
+  def get_operations(self) -> list[int]:
+    operations: list[int] = list()
+    opcodes, offsets = self.__opcodes, self.__offsets
+    covered = len(opcodes)
+    for i in reversed(range(len(opcodes))):
+      if i >= covered: continue
+      if opcodes[i] == Opcode.UNARY:
+        covered = offsets[i]
+      elif opcodes[i] in OPERATIONS:
+        operations.append(i)
+    operations.reverse()
+    return operations
+
+
+  def get_depth(self) -> int:
+    if not self: return 0
+    depths = array('l', bytes(len(self) * array('l').itemsize))
+    offsets = self.__offsets
+    for i in range(len(self)):
+      depth = 0
+      child = i - 1
+      while child >= offsets[i]:
+        if depths[child] > depth: depth = depths[child]
+        child = offsets[child] - 1
+      depths[i] = depth + 1
+    return depths[-1]
+
+
+  def __append(self, opcode: Opcode, token: (Token | None), offset: int):
+    self.__opcodes.append(opcode)
+    self.__offsets.append(offset)
+    if token is None:
+      self.__operands.append(-1)
+      return
+    self.__operands.append(len(self.__tokens))
+    self.__tokens.append(token)
+
+
+  def __len__(self) -> int:
+    return len(self.__opcodes)
+
+
+  def __iter__(self) -> Iterator[tuple[Opcode, Token | None, int]]:
+    for i in range(len(self)): yield self.get_opcode(i), self.get_token(i), self.__offsets[i]
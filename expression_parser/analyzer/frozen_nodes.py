@@ -0,0 +1,141 @@
+from typing import NamedTuple
+from types import NoneType
+from expression_parser.parser.tokens import Token, TokenType
+from .tree_nodes import Node, NodesTuple, UnaryOperatorNode, BinaryOperatorNode, FunctionNode, fold_tree
+
+
+class FrozenToken(NamedTuple):
+  type: TokenType
+  value: str
+  start: int
+  end: int
+
+  def __repr__(self) -> str:
+    return f'<type: {self.type.name}, value: "{self.value}", start: {self.start}, end: {self.end}>'
+
+
+  @staticmethod
+  def of(token: (Token | NoneType)):
+    if token is None: return None
+    return FrozenToken(token.type, token.value, token.start, token.end)
+
+
+  def thaw(self) -> Token:
+    return Token(self.type, self.value, self.start, self.end)
+
+
+class FrozenNode:
+  __slots__ = ('value', '_hash')
+
+  def __init__(self, value: (FrozenToken | NoneType)):
+    object.__setattr__(self, 'value', value)
+    object.__setattr__(self, '_hash', hash((type(self), self.get_symbol(), self.children())))
+
+
+  def get_symbol(self) -> (tuple[TokenType, str] | NoneType):
+    return (self.value.type, self.value.value) if self.value else None
+
+
+  def children(self) -> tuple['FrozenNode', ...]:
+    return tuple()
+
+
+  def __setattr__(self, name: str, value):
+    raise AttributeError(f'{type(self).__name__} is immutable')
+
+
+  def __delattr__(self, name: str):
+    raise AttributeError(f'{type(self).__name__} is immutable')
+
+
+  def __hash__(self) -> int:
+    return self._hash
+
+
+  def __eq__(self, other) -> bool:
+    if not isinstance(other, FrozenNode): return NotImplemented
+    stack = [(self, other)]
+    while stack:
+      a, b = stack.pop()
+      if a is b: continue
+      if type(a) is not type(b) or a._hash != b._hash or a.get_symbol() != b.get_symbol(): return False
+      ca, cb = a.children(), b.children()
+      if len(ca) != len(cb): return False
+      stack.extend(zip(ca, cb))
+    return True
+
+
+  def __repr__(self) -> str:
+    return f'{type(self).__name__}(value={self.value!r})'
+
+
+FrozenNodesTuple = tuple[FrozenNode, ...]
+
+
+class FrozenUnaryOperatorNode(FrozenNode):
+  __slots__ = ('expression',)
+
+  def __init__(self, value: FrozenToken, expression: FrozenNode):
+    object.__setattr__(self, 'expression', expression)
+    super().__init__(value)
+
+
+  def children(self) -> FrozenNodesTuple:
+    return (self.expression,)
+
+
+class FrozenBinaryOperatorNode(FrozenNode):
+  __slots__ = ('left', 'right')
+
+  def __init__(self, value: FrozenToken, left: FrozenNode, right: FrozenNode):
+    object.__setattr__(self, 'left', left)
+    object.__setattr__(self, 'right', right)
+    super().__init__(value)
+
+
+  def children(self) -> FrozenNodesTuple:
+    return (self.left, self.right)
+
+
+class FrozenFunctionNode(FrozenNode):
+  __slots__ = ('args',)
+
+  def __init__(self, value: FrozenToken, args: FrozenNodesTuple):
+    object.__setattr__(self, 'args', tuple(args))
+    super().__init__(value)
+
+
+  def children(self) -> FrozenNodesTuple:
+    return self.args
+
+
+def freeze(tree: Node) -> FrozenNode:
+  return fold_tree(tree, freeze_node)
+
+
+def thaw(tree: FrozenNode) -> Node:
+  return fold_tree(tree, thaw_node)
+
+
+def freeze_node(node: Node, children: FrozenNodesTuple) -> FrozenNode:
+  token = FrozenToken.of(node.value)
+  match node:
+    case UnaryOperatorNode():
+      return FrozenUnaryOperatorNode(token, *children)
+    case BinaryOperatorNode():
+      return FrozenBinaryOperatorNode(token, *children)
+    case FunctionNode():
+      return FrozenFunctionNode(token, children)
+  return FrozenNode(token)
+
+
+def thaw_node(node: FrozenNode, children: NodesTuple) -> Node:
+  token = node.value.thaw() if node.value else None
+  match node:
+    case FrozenUnaryOperatorNode():
+      return UnaryOperatorNode(token, *children)
+    case FrozenBinaryOperatorNode():
+      return BinaryOperatorNode(token, *children)
+    case FrozenFunctionNode():
+      return FunctionNode(token, children)
+  return Node(token)
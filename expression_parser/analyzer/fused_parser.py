@@ -0,0 +1,37 @@
+from typing import Callable, Iterable, Iterator, TextIO
+from types import NoneType
+from expression_parser.parser.tokens import Token
+from expression_parser.parser.expression_scanner import ExpressionScanner, CHUNK_SIZE
+from .tree_nodes import Node
+from .syntax_analyzer import SyntaxAnalysisException
+from .iterative_analyzer import IterativeSyntaxAnalyzer
+
+
+def parse(expression: str | TextIO, token_sink: (Callable[[Token], NoneType] | NoneType) = None, chunk_size: int = CHUNK_SIZE, recover: bool = False) -> Node:
+  scanner = ExpressionScanner()
+  if isinstance(expression, str):
+    chunks = (expression[i:i + chunk_size] for i in range(0, len(expression), chunk_size))
+    tokens = scanner.scan_chunks(chunks)
+  else:
+    tokens = scanner.scan_stream(expression, chunk_size)
+  if token_sink: tokens = __tap(tokens, token_sink)
+  try:
+    tree = IterativeSyntaxAnalyzer(tokens, recover).get_tree()
+  except (SyntaxAnalysisException, ExceptionGroup):
+    for _ in tokens: pass
+    __check_parsing_exceptions(scanner)
+    raise
+  __check_parsing_exceptions(scanner)
+  return tree
+
+
+def __tap(tokens: Iterable[Token], sink: Callable[[Token], NoneType]) -> Iterator[Token]:
+  for t in tokens:
+    sink(t)
+    yield t
+
+
+def __check_parsing_exceptions(scanner: ExpressionScanner):
+  parsing_exceptions = scanner.get_exceptions()
+  if parsing_exceptions:
+    raise ExceptionGroup('Parsing errors', parsing_exceptions)
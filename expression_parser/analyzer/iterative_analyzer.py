@@ -0,0 +1,187 @@
+from enum import Enum
+from typing import Iterable, Iterator
+from types import NoneType
+from expression_parser.parser.tokens import Token, TokenType, Operator, Signature
+from .tree_nodes import Node, FunctionNode, UnaryOperatorNode, BinaryOperatorNode
+from .syntax_analyzer import SyntaxAnalysisException, check_function_args_count
+
+
+class Step(Enum):
+  ADDITIVE = 'ADDITIVE'
+  MULTIPLICATIVE = 'MULTIPLICATIVE'
+  UNARY = 'UNARY'
+  PARENTHESIS = 'PARENTHESIS'
+  ARGUMENTS = 'ARGUMENTS'
+
+
+Frame = tuple[Step, Token | NoneType, Node | list[Node] | NoneType]
+
+
+class IterativeSyntaxAnalyzer:
+  def __init__(self, tokens: Iterable[Token], recover: bool = False):
+    self.__tokens: Iterator[Token] = iter(tokens)
+    self.__current: (Token | NoneType) = next(self.__tokens, None)
+    self.__tree: Node = None
+    self.__recover: bool = recover
+    self.__exceptions: list[SyntaxAnalysisException] = list()
+    self.__regions: list[int] = list()
+    self.__analyze()
+    if self.__exceptions:
+      raise ExceptionGroup('Syntax errors', self.__exceptions)
+
+
+  def get_tree(self) -> Node:
+    return self.__tree
+
+
+  def __analyze(self):
+    if not self.__current:
+      self.__tree = Node(value=None)
+      return
+    self.__tree = self.__build_tree()
+    last_peeked = self.__get_current_token()
+    while last_peeked:
+      self.__report(SyntaxAnalysisException('Unexpected token: "{token}"', last_peeked))
+      self.__get_current_token(advance=True)
+      if self.__get_current_token(): self.__build_tree()
+      last_peeked = self.__get_current_token()
+
+
+  def __get_current_token(self, advance: bool = False) -> (Token | NoneType):
+    token = self.__current
+    if advance: self.__current = next(self.__tokens, None)
+    return token
+
+
+  def __report(self, exception: SyntaxAnalysisException):
+    if not self.__recover: raise exception
+    self.__exceptions.append(exception)
+
+
+  def __build_tree(self) -> Node:
+    stack: list[Frame] = list()
+    try:
+      node = self.__descend(stack, Step.ADDITIVE)
+    except SyntaxAnalysisException as e:
+      node = self.__recover_region(stack, e)
+    while stack:
+      try:
+        node = self.__reduce(stack, node)
+      except SyntaxAnalysisException as e:
+        node = self.__recover_region(stack, e)
+    return node
+
+
+  def __reduce(self, stack: list[Frame], node: Node) -> Node:
+    step, token, data = stack.pop()
+    match step:
+      case Step.ADDITIVE | Step.MULTIPLICATIVE:
+        left = BinaryOperatorNode(value=token, left=data, right=node) if token else node
+        current = self.__get_current_token()
+        if step == Step.ADDITIVE:
+          chained = current and current.value in (Operator.PLUS.value, Operator.MINUS.value)
+        else:
+          chained = current and current.type == TokenType.OPERATOR and not Operator.isunary(current.value)
+        if not chained:
+          if step == Step.ADDITIVE: self.__regions.pop()
+          return left
+        stack.append((step, self.__get_current_token(advance=True), left))
+        next_step = Step.MULTIPLICATIVE if step == Step.ADDITIVE else Step.UNARY
+        return self.__descend(stack, next_step)
+      case Step.UNARY:
+        return UnaryOperatorNode(value=token, expression=node)
+      case Step.PARENTHESIS:
+        closing = self.__get_current_token()
+        if not (closing and closing.value == Signature.RIGHT_PARENTHESIS):
+          template = 'No right parenthesis found for: "{token}"; '
+          message_end = f'expecting "{Signature.RIGHT_PARENTHESIS}"'
+          raise SyntaxAnalysisException(template + message_end, token)
+        self.__get_current_token(advance=True)
+        return node
+      case Step.ARGUMENTS:
+        data.append(node)
+        current = self.__get_current_token()
+        if current and current.type == TokenType.DELIMITER:
+          self.__get_current_token(advance=True)
+          stack.append((step, token, data))
+          return self.__descend(stack, Step.ADDITIVE)
+        return self.__close_function(token, data)
+
+
+  def __recover_region(self, stack: list[Frame], exception: SyntaxAnalysisException) -> Node:
+    if not self.__recover: raise exception
+    self.__exceptions.append(exception)
+    del stack[self.__regions.pop():]
+    self.__synchronize()
+    return Node(value=exception.token)
+
+
+  def __synchronize(self):
+    depth = 0
+    token = self.__get_current_token()
+    while token:
+      if token.value == Signature.LEFT_PARENTHESIS:
+        depth += 1
+      elif token.value == Signature.RIGHT_PARENTHESIS:
+        if not depth: return
+        depth -= 1
+      elif token.type == TokenType.DELIMITER and not depth:
+        return
+      self.__get_current_token(advance=True)
+      token = self.__get_current_token()
+
+
+  def __descend(self, stack: list[Frame], step: Step) -> Node:
+    while True:
+      if step == Step.ADDITIVE:
+        self.__regions.append(len(stack))
+        stack.append((Step.ADDITIVE, None, None))
+        step = Step.MULTIPLICATIVE
+      if step == Step.MULTIPLICATIVE:
+        stack.append((Step.MULTIPLICATIVE, None, None))
+      token = self.__get_current_token()
+      while token and Operator.isunary(token.value):
+        stack.append((Step.UNARY, self.__get_current_token(advance=True), None))
+        token = self.__get_current_token()
+
+      if token and token.type in (TokenType.VARIABLE, TokenType.FUNCTION):
+        token = self.__get_current_token(advance=True)
+        token_next = self.__get_current_token()
+        if not (token_next and token_next.value == Signature.LEFT_PARENTHESIS):
+          if token.type == TokenType.FUNCTION:
+            message = f'Declared function "{token.value}()" sould be called: '
+            self.__report(SyntaxAnalysisException(message + '"{token}"', token))
+          return Node(value=token)
+        self.__get_current_token(advance=True)
+        if token.type != TokenType.FUNCTION:
+          self.__report(SyntaxAnalysisException('No such function, cannot call: "{token}"', token))
+        token_next = self.__get_current_token()
+        if token_next and token_next.value == Signature.RIGHT_PARENTHESIS:
+          return self.__close_function(token, list())
+        stack.append((Step.ARGUMENTS, token, list()))
+        step = Step.ADDITIVE
+        continue
+
+      if token and token.type == TokenType.CONSTANT:
+        return Node(value=self.__get_current_token(advance=True))
+
+      if token and token.value == Signature.LEFT_PARENTHESIS:
+        stack.append((Step.PARENTHESIS, self.__get_current_token(advance=True), None))
+        step = Step.ADDITIVE
+        continue
+
+      raise SyntaxAnalysisException('Nonparsable token: "{token}"', token)
+
+
+  def __close_function(self, fn: Token, args: list[Node]) -> FunctionNode:
+    token = self.__get_current_token()
+    if not (token and token.value == Signature.RIGHT_PARENTHESIS):
+      raise SyntaxAnalysisException('Right parenthesis expected for: "{token}"', fn)
+    self.__get_current_token(advance=True)
+    args_tuple = tuple(args)
+    if fn.type == TokenType.FUNCTION:
+      try:
+        check_function_args_count(fn, args_tuple)
+      except SyntaxAnalysisException as e:
+        self.__report(e)
+    return FunctionNode(value=fn, args=args_tuple)
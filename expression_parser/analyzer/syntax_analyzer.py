@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Iterable, Sequence
 from types import NoneType
 from expression_parser.parser.tokens import Token, TokenType, Operator, Signature, functions_args
 from .tree_nodes import Node, FunctionNode, UnaryOperatorNode, BinaryOperatorNode, NodesTuple
@@ -11,11 +11,15 @@ class SyntaxAnalysisException(Exception):
 
 
 class SyntaxAnalyzer:
-  def __init__(self, tokens: Iterable[Token]):
+  def __init__(self, tokens: Iterable[Token], recover: bool = False):
     self.__position: int = 0
-    self.__tokens: tuple[Token] = tuple(tokens)
+    self.__tokens: Sequence[Token] = tokens if isinstance(tokens, Sequence) else tuple(tokens)
     self.__tree: Node = None
+    self.__recover: bool = recover
+    self.__exceptions: list[SyntaxAnalysisException] = list()
     self.__analyze()
+    if self.__exceptions:
+      raise ExceptionGroup('Syntax errors', self.__exceptions)
 
 
   def get_tree(self) -> Node:
@@ -26,10 +30,15 @@ class SyntaxAnalyzer:
     if not self.__tokens:
       self.__tree = Node(value=None)
       return
-    self.__tree = self.__build_additive_node()
+    self.__tree = self.__build_recoverable_node()
     last_peeked = self.__get_current_token()
-    if last_peeked:
+    if last_peeked and not self.__recover:
       raise SyntaxAnalysisException('Unexpected token: "{token}"', last_peeked)
+    while last_peeked:
+      self.__exceptions.append(SyntaxAnalysisException('Unexpected token: "{token}"', last_peeked))
+      self.__get_current_token(next=True)
+      if self.__get_current_token(): self.__build_recoverable_node()
+      last_peeked = self.__get_current_token()
 
 
   def __get_current_token(self, next: bool=False) -> (Token | NoneType):
@@ -37,6 +46,36 @@ class SyntaxAnalyzer:
     if next: self.__position += 1
     return token
 
+
+  def __report(self, exception: SyntaxAnalysisException):
+    if not self.__recover: raise exception
+    self.__exceptions.append(exception)
+
+
+  def __build_recoverable_node(self) -> Node:
+    if not self.__recover: return self.__build_additive_node()
+    try:
+      return self.__build_additive_node()
+    except SyntaxAnalysisException as e:
+      self.__exceptions.append(e)
+      self.__synchronize()
+      return Node(value=e.token)
+
+
+  def __synchronize(self):
+    depth = 0
+    token = self.__get_current_token()
+    while token:
+      if token.value == Signature.LEFT_PARENTHESIS:
+        depth += 1
+      elif token.value == Signature.RIGHT_PARENTHESIS:
+        if not depth: return
+        depth -= 1
+      elif token.type == TokenType.DELIMITER and not depth:
+        return
+      self.__get_current_token(next=True)
+      token = self.__get_current_token()
+
   
   def __build_additive_node(self) -> Node:
     left = self.__build_multiplicative_node()
@@ -78,7 +117,7 @@ class SyntaxAnalyzer:
       else:
         if token.type == TokenType.FUNCTION:
           message = f'Declared function "{token.value}()" sould be called: '
-          raise SyntaxAnalysisException(message + '"{token}"', token)
+          self.__report(SyntaxAnalysisException(message + '"{token}"', token))
         return Node(value=token)
     
     if token and token.type == TokenType.CONSTANT:
@@ -87,12 +126,13 @@ class SyntaxAnalyzer:
 
     if token and token.value == Signature.LEFT_PARENTHESIS:
       lp = self.__get_current_token(next=True)
-      expression = self.__build_additive_node()
-      token = self.__get_current_token(next=True)
+      expression = self.__build_recoverable_node()
+      token = self.__get_current_token()
       if not (token and token.value == Signature.RIGHT_PARENTHESIS):
         template = 'No right parenthesis found for: "{token}"; '
         message_end = f'expecting "{Signature.RIGHT_PARENTHESIS}"'
         raise SyntaxAnalysisException(template + message_end, lp)
+      self.__get_current_token(next=True)
       return expression
 
     raise SyntaxAnalysisException('Nonparsable token: "{token}"', token)
@@ -103,15 +143,21 @@ class SyntaxAnalyzer:
     args: NodesTuple = tuple()
     if not (token and token.value == Signature.LEFT_PARENTHESIS):
       raise SyntaxAnalysisException('Function call (left parenthesis) expected for: "{token}"', fn)
-    if not (fn and fn.type == TokenType.FUNCTION):
-      raise SyntaxAnalysisException('No such function, cannot call: "{token}"', fn)
+    defined = fn and fn.type == TokenType.FUNCTION
+    if not defined:
+      self.__report(SyntaxAnalysisException('No such function, cannot call: "{token}"', fn))
     token = self.__get_current_token()
     if not (token and token.value == Signature.RIGHT_PARENTHESIS):
       args = self.__get_function_args()
-    token = self.__get_current_token(next=True)
+    token = self.__get_current_token()
     if not (token and token.value == Signature.RIGHT_PARENTHESIS):
       raise SyntaxAnalysisException('Right parenthesis expected for: "{token}"', fn)
-    self.__check_function_args_count(fn, args)
+    self.__get_current_token(next=True)
+    if defined:
+      try:
+        check_function_args_count(fn, args)
+      except SyntaxAnalysisException as e:
+        self.__report(e)
     return FunctionNode(value=fn, args=args)
 
 
@@ -120,7 +166,7 @@ class SyntaxAnalyzer:
     expression: (Node | NoneType) = None
     args: list[Node] = list()
     while True:
-      expression = self.__build_additive_node()
+      expression = self.__build_recoverable_node()
       if not expression: break
       args.append(expression)
       token = self.__get_current_token()
@@ -129,11 +175,11 @@ class SyntaxAnalyzer:
       self.__get_current_token(next=True)
     return tuple(args)
 
-  
-  def __check_function_args_count(self, fn: TokenType, args: list[Node]):
-    expected = functions_args[fn.value]
-    actual = len(args)
-    if expected == actual: return
-    args_count = 'few' if expected > actual else 'many'
-    message_start = f'Too {args_count} arguments (given: {actual}) for called funtion (expected: {expected}): '
-    raise SyntaxAnalysisException(message_start + '"{token}"', fn)
+
+def check_function_args_count(fn: Token, args: NodesTuple):
+  expected = functions_args[fn.value]
+  actual = len(args)
+  if expected == actual: return
+  args_count = 'few' if expected > actual else 'many'
+  message_start = f'Too {args_count} arguments (given: {actual}) for called funtion (expected: {expected}): '
+  raise SyntaxAnalysisException(message_start + '"{token}"', fn)
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from types import NoneType
+from typing import Callable, Iterator, TypeVar
 from expression_parser.parser.tokens import Token
 import json
 
@@ -14,21 +15,60 @@ class Node:
     return json.dumps(parse(self), default=parse, indent=2)
 
 
+  def children(self) -> 'NodesTuple':
+    return tuple()
+
+
 NodesTuple = tuple[Node, ...]
 
 @dataclass
 class UnaryOperatorNode(Node):
   expression: (Node | NoneType)
 
+  def children(self) -> 'NodesTuple':
+    return (self.expression,)
+
 
 @dataclass
 class BinaryOperatorNode(Node):
   left: (Node | NoneType)
   right: (Node | NoneType)
 
+  def children(self) -> 'NodesTuple':
+    return (self.left, self.right)
+
 
 @dataclass
 class FunctionNode(Node):
   args: NodesTuple
 
+  def children(self) -> 'NodesTuple':
+    return tuple(self.args)
+
+
+Folded = TypeVar('Folded')
+
+
+def get_children(node: (Node | NoneType)) -> NodesTuple:
+  return tuple() if node is None else node.children()
+
+
+def iter_postorder(tree: (Node | NoneType), visited: (set[int] | NoneType) = None) -> Iterator[Node]:
+  visited = set() if visited is None else visited
+  stack: list[tuple[(Node | NoneType), bool]] = [(tree, False)]
+  while stack:
+    node, expanded = stack.pop()
+    if node is None or id(node) in visited: continue
+    if not expanded:
+      stack.append((node, True))
+      stack.extend((child, False) for child in reversed(get_children(node)))
+      continue
+    visited.add(id(node))
+    yield node
+
 
+def fold_tree(tree: (Node | NoneType), combine: Callable[[Node, tuple], Folded]) -> (Folded | NoneType):
+  folded: dict[int, Folded] = {id(None): None}
+  for node in iter_postorder(tree):
+    folded[id(node)] = combine(node, tuple(folded[id(child)] for child in get_children(node)))
+  return folded[id(tree)]
@@ -1,8 +1,7 @@
 from types import NoneType
-from expression_parser.parser.tokens import Token, Operator
-from expression_parser.analyzer.tree_nodes import Node, BinaryOperatorNode, FunctionNode
-from .utils import flat_operations, take_flat, take_ready, take_congenerical
-from .containers import ConveyorStep, OperationDuration, SimulationData, LAYERS_COUNT
+from expression_parser.analyzer.tree_nodes import Node
+from .utils import flat_operations, take_flat, take_ready, take_congenerical, get_operation_duration
+from .containers import ConveyorStep, SimulationData, LAYERS_COUNT
 
 
 class DynamicConveyor:
@@ -47,7 +46,7 @@ class DynamicConveyor:
   def __generate_results(self) -> SimulationData:
     result = SimulationData(steps=tuple(self.__steps))
     result.layers = self.__layers
-    result.sequential = self.__layers * sum(self.__get_tacts(n) for n in self.__operations_fulfileld)
+    result.sequential = self.__layers * sum(get_operation_duration(n) for n in self.__operations_fulfileld)
     result.dynamic = sum(s.tacts for s in self.__steps)
     result.acceleration = result.sequential / result.dynamic if result.dynamic else 1
     result.efficiency = result.acceleration / self.__layers
@@ -64,22 +63,4 @@ class DynamicConveyor:
     
 
   def __calc_step_tacts(self, layers: list[Node | NoneType]) -> float:
-    return max(self.__get_tacts(n) for n in layers)
-
-
-  def __get_tacts(self, node: Token) -> float:
-    match node:
-      case FunctionNode():
-        return OperationDuration.FUNCTION
-      case BinaryOperatorNode(value=Token(value=Operator.PLUS.value)):
-        return OperationDuration.PLUS
-      case BinaryOperatorNode(value=Token(value=Operator.MINUS.value)):
-        return OperationDuration.MIN
-      case BinaryOperatorNode(value=Token(value=Operator.MULTIPLY.value)):
-        return OperationDuration.MUL
-      case BinaryOperatorNode(value=Token(value=Operator.DIVIDE.value)):
-        return OperationDuration.DIV
-      case BinaryOperatorNode(value=Token(value=Operator.POWER.value)):
-        return OperationDuration.POW
-      case None:
-        return 0
+    return max(get_operation_duration(n) for n in layers)
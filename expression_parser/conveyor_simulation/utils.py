@@ -1,16 +1,33 @@
 from types import NoneType
 from expression_parser.parser.tokens import Operator
+from expression_parser.parser.symbol_table import SYMBOLS, intern_symbol
 from expression_parser.analyzer.tree_nodes import Node, BinaryOperatorNode, FunctionNode
+from .containers import OperationDuration
 
 
-def flat_operations(node: Node, container: list[Node]):
+OPERATION_DURATIONS: dict[int, float] = {
+  SYMBOLS.add(Operator.PLUS.value): OperationDuration.PLUS,
+  SYMBOLS.add(Operator.MINUS.value): OperationDuration.MIN,
+  SYMBOLS.add(Operator.MULTIPLY.value): OperationDuration.MUL,
+  SYMBOLS.add(Operator.DIVIDE.value): OperationDuration.DIV,
+  SYMBOLS.add(Operator.POWER.value): OperationDuration.POW,
+}
+
+CONGENERICAL_OPERATORS: frozenset[int] = frozenset((SYMBOLS.add(Operator.PLUS.value), SYMBOLS.add(Operator.MULTIPLY.value)))
+
+
+def flat_operations(node: Node, container: list[Node], visited: (set[int] | NoneType) = None):
+  if visited is None: visited = set()
+  if id(node) in visited: return
   match node:
     case BinaryOperatorNode():
-      flat_operations(node.left, container)
-      flat_operations(node.right, container)
+      flat_operations(node.left, container, visited)
+      flat_operations(node.right, container, visited)
+      visited.add(id(node))
       container.append(node)
     case FunctionNode():
-      for arg in node.args: flat_operations(arg, container)
+      for arg in node.args: flat_operations(arg, container, visited)
+      visited.add(id(node))
       container.append(node)
 
 
@@ -51,11 +68,21 @@ def take_ready(left: list[Node], fulfilled: list[Node]) -> (Node | NoneType):
 
 def take_congenerical(left: list[Node], previous_layers: list[Node | NoneType]) -> (Node | NoneType):
   for i, n in enumerate(left):
-    if n.value.value not in (Operator.PLUS.value, Operator.MULTIPLY.value):
+    symbol_id = intern_symbol(n.value)
+    if symbol_id not in CONGENERICAL_OPERATORS:
       return None
     children = tuple(p for p in previous_layers if n.left is p or n.right is p)
-    fit = children and all(c.value.value == n.value.value for c in children)
+    fit = children and all(intern_symbol(c.value) == symbol_id for c in children)
     if not fit: continue
     left.pop(i)
     return n
   return None
+
+
+def get_operation_duration(node: (Node | NoneType)) -> float:
+  match node:
+    case FunctionNode():
+      return OperationDuration.FUNCTION
+    case BinaryOperatorNode():
+      return OPERATION_DURATIONS.get(intern_symbol(node.value), 0)
+  return 0
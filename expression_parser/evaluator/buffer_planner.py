@@ -0,0 +1,147 @@
+from enum import IntEnum
+from functools import lru_cache
+from typing import Mapping
+import numpy as np
+from numpy.typing import ArrayLike
+from expression_parser.parser.symbol_table import get_number
+from expression_parser.analyzer.tree_nodes import Node
+from expression_parser.analyzer.flat_tree import Opcode
+from expression_parser.analyzer.frozen_nodes import FrozenNode, freeze
+from .program import Program, EvaluationException, get_program, get_variables
+from .vectorized import BINARY_UFUNCS, UNARY_UFUNCS, FUNCTION_UFUNCS, RANDOM_FUNCTION, COMPILED_CACHE_SIZE, FLOATING_POINT_ERRORS
+
+
+CHUNK_ELEMENTS = 1 << 13
+OUTPUT_BUFFER = -1
+
+
+class Source(IntEnum):
+  VARIABLE = 0
+  CONSTANT = 1
+  BUFFER = 2
+
+
+Operand = tuple[Source, str | np.float64 | int]
+PlannedStep = tuple[np.ufunc | None, tuple[Operand, ...], int]
+
+
+class BufferPlan:
+  def __init__(self, program: Program):
+    self.__variables: tuple[str, ...] = get_variables(program)
+    self.__steps: list[PlannedStep] = list()
+    self.__buffers_count: int = 0
+    self.__result: Operand = self.__plan(program)
+
+
+  def get_variables(self) -> tuple[str, ...]:
+    return self.__variables
+
+
+  def get_buffers_count(self) -> int:
+    return self.__buffers_count
+
+
+  def get_steps(self) -> tuple[PlannedStep, ...]:
+    return tuple(self.__steps)
+
+
+  def evaluate(
+    self,
+    bindings: Mapping[str, ArrayLike],
+    out: (np.ndarray | None) = None,
+    chunk_elements: int = CHUNK_ELEMENTS,
+    rng: (np.random.Generator | None) = None,
+  ) -> np.ndarray:
+    arrays = dict()
+    for v in self.__variables:
+      if v not in bindings: raise EvaluationException('Unbound variable "{symbol}"', v)
+      arrays[v] = np.asarray(bindings[v])
+    shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+    arrays = {v: np.broadcast_to(a, shape) for v, a in arrays.items()}
+    if out is None: out = np.empty(shape, dtype=np.float64)
+    random = rng if rng else np.random.default_rng()
+    if not shape:
+      self.__evaluate_chunk(arrays, out, [np.empty(shape) for _ in range(self.__buffers_count)], random)
+      return out
+    row_size = int(np.prod(shape[1:], dtype=np.int64))
+    rows = max(1, chunk_elements // max(row_size, 1))
+    buffers = [np.empty((rows, *shape[1:])) for _ in range(self.__buffers_count)]
+    for start in range(0, shape[0], rows):
+      end = min(start + rows, shape[0])
+      chunk = {v: a[start:end] for v, a in arrays.items()}
+      self.__evaluate_chunk(chunk, out[start:end], [b[:end - start] for b in buffers], random)
+    return out
+
+
+  def __evaluate_chunk(self, arrays: dict[str, np.ndarray], out: np.ndarray, buffers: list[np.ndarray], random: np.random.Generator):
+    resolve = lambda source, value: arrays[value] if source == Source.VARIABLE else (buffers[value] if source == Source.BUFFER else value)
+    try:
+      with np.errstate(**FLOATING_POINT_ERRORS):
+        for ufunc, operands, target in self.__steps:
+          destination = out if target == OUTPUT_BUFFER else buffers[target]
+          if ufunc is None:
+            random.random(out=destination)
+            continue
+          ufunc(*(resolve(*o) for o in operands), out=destination, dtype=np.float64)
+    except FloatingPointError as e:
+      raise EvaluationException('Arithmetic error: {symbol}', str(e)) from None
+    if self.__result[0] != Source.BUFFER:
+      out[...] = resolve(*self.__result)
+
+
+  def __plan(self, program: Program) -> Operand:
+    stack: list[Operand] = list()
+    free: list[int] = list()
+    for i, (opcode, value, arity) in enumerate(program):
+      if opcode == Opcode.LEAF:
+        number = get_number(value)
+        stack.append((Source.VARIABLE, value) if number is None else (Source.CONSTANT, np.float64(number)))
+        continue
+      operands = tuple(stack[len(stack) - arity:]) if arity else tuple()
+      if arity: del stack[-arity:]
+      free.extend(reversed([index for source, index in operands if source == Source.BUFFER]))
+      if i == len(program) - 1:
+        target = OUTPUT_BUFFER
+      elif free:
+        target = free.pop()
+      else:
+        target = self.__buffers_count
+        self.__buffers_count += 1
+      self.__steps.append((BufferPlan.__get_ufunc(opcode, value), operands, target))
+      stack.append((Source.BUFFER, target))
+    return stack.pop()
+
+
+  @staticmethod
+  def __get_ufunc(opcode: int, value: str) -> (np.ufunc | None):
+    match opcode:
+      case Opcode.UNARY:
+        return UNARY_UFUNCS[value]
+      case Opcode.BINARY:
+        return BINARY_UFUNCS[value]
+      case Opcode.FUNCTION if value == RANDOM_FUNCTION:
+        return None
+    return FUNCTION_UFUNCS[value]
+
+
+def evaluate_chunked(
+  tree: Node,
+  bindings: Mapping[str, ArrayLike],
+  out: (np.ndarray | None) = None,
+  chunk_elements: int = CHUNK_ELEMENTS,
+  rng: (np.random.Generator | None) = None,
+) -> np.ndarray:
+  return plan_buffers(tree).evaluate(bindings, out, chunk_elements, rng)
+
+
+def plan_buffers(tree: Node) -> BufferPlan:
+  return plan_frozen_buffers(freeze(tree))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def plan_frozen_buffers(tree: FrozenNode) -> BufferPlan:
+  return plan_program_buffers(get_program(tree))
+
+
+def plan_program_buffers(program: Program) -> BufferPlan:
+  return BufferPlan(program)
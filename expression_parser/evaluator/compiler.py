@@ -0,0 +1,120 @@
+import ast
+import math
+import random
+from functools import lru_cache
+from typing import Callable, Mapping
+from expression_parser.parser.tokens import Operator
+from expression_parser.parser.symbol_table import get_number
+from expression_parser.analyzer.tree_nodes import Node
+from expression_parser.analyzer.flat_tree import Opcode
+from expression_parser.analyzer.frozen_nodes import FrozenNode, freeze
+from .program import Program, EvaluationException, get_program, get_variables
+
+
+FUNCTIONS: dict[str, Callable[..., float]] = dict(
+  sin=math.sin,
+  cos=math.cos,
+  rand=random.random,
+  max=max,
+  min=min,
+  pow=math.pow,
+)
+
+BINARY_OPERATORS: dict[str, type[ast.operator]] = {
+  Operator.PLUS.value: ast.Add,
+  Operator.MINUS.value: ast.Sub,
+  Operator.MULTIPLY.value: ast.Mult,
+  Operator.DIVIDE.value: ast.Div,
+}
+
+UNARY_OPERATORS: dict[str, type[ast.unaryop]] = {
+  Operator.PLUS.value: ast.UAdd,
+  Operator.MINUS.value: ast.USub,
+}
+
+MAX_EXPRESSION_DEPTH = 64
+COMPILED_CACHE_SIZE = 256
+BINDINGS_NAME = 'bindings'
+
+
+class CompiledExpression:
+  def __init__(self, variables: tuple[str, ...], function: Callable[[Mapping[str, float]], float]):
+    self.__variables: tuple[str, ...] = variables
+    self.__function: Callable[[Mapping[str, float]], float] = function
+
+
+  def get_variables(self) -> tuple[str, ...]:
+    return self.__variables
+
+
+  def __call__(self, bindings: Mapping[str, float]) -> float:
+    try:
+      return self.__function(bindings)
+    except KeyError as e:
+      raise EvaluationException('Unbound variable "{symbol}"', e.args[0]) from None
+    except (ArithmeticError, ValueError) as e:
+      raise EvaluationException('Arithmetic error: {symbol}', str(e)) from None
+
+
+def evaluate(tree: Node, bindings: Mapping[str, float]) -> float:
+  return compile_tree(tree)(bindings)
+
+
+def compile_tree(tree: Node) -> CompiledExpression:
+  return compile_frozen_tree(freeze(tree))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def compile_frozen_tree(tree: FrozenNode) -> CompiledExpression:
+  return compile_program(get_program(tree))
+
+
+def compile_program(program: Program) -> CompiledExpression:
+  variables = get_variables(program)
+  locals_names = {v: f'_v{i}' for i, v in enumerate(variables)}
+  body: list[ast.stmt] = [
+    ast.Assign(
+      targets=[ast.Name(locals_names[v], ast.Store())],
+      value=ast.Subscript(ast.Name(BINDINGS_NAME, ast.Load()), ast.Constant(v), ast.Load()),
+    )
+    for v in variables
+  ]
+  stack: list[tuple[ast.expr, int]] = list()
+  for opcode, value, arity in program:
+    operands = stack[len(stack) - arity:] if arity else list()
+    if arity: del stack[-arity:]
+    args = [e for e, _ in operands]
+    match opcode:
+      case Opcode.UNARY:
+        expression = ast.UnaryOp(UNARY_OPERATORS[value](), *args)
+      case Opcode.BINARY if value == Operator.POWER.value:
+        expression = __call_function('pow', args)
+      case Opcode.BINARY:
+        expression = ast.BinOp(args[0], BINARY_OPERATORS[value](), args[1])
+      case Opcode.FUNCTION:
+        expression = __call_function(value, args)
+      case _:
+        number = get_number(value)
+        expression = ast.Constant(number) if number is not None else ast.Name(locals_names[value], ast.Load())
+    depth = 1 + max((d for _, d in operands), default=0)
+    if depth > MAX_EXPRESSION_DEPTH:
+      temporary = f'_t{len(body)}'
+      body.append(ast.Assign(targets=[ast.Name(temporary, ast.Store())], value=expression))
+      expression, depth = ast.Name(temporary, ast.Load()), 1
+    stack.append((expression, depth))
+  body.append(ast.Return(stack.pop()[0]))
+
+  function = ast.FunctionDef(
+    name='evaluate',
+    args=ast.arguments(posonlyargs=[], args=[ast.arg(BINDINGS_NAME)], kwonlyargs=[], kw_defaults=[], defaults=[]),
+    body=body,
+    decorator_list=[],
+  )
+  module = ast.fix_missing_locations(ast.Module(body=[function], type_ignores=[]))
+  namespace = {f'_f_{name}': fn for name, fn in FUNCTIONS.items()}
+  exec(compile(module, '<expression>', 'exec'), namespace)
+  return CompiledExpression(variables, namespace['evaluate'])
+
+
+def __call_function(name: str, args: list[ast.expr]) -> ast.Call:
+  return ast.Call(ast.Name(f'_f_{name}', ast.Load()), args, [])
@@ -0,0 +1,87 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from multiprocessing.shared_memory import SharedMemory
+from typing import Mapping
+import numpy as np
+from numpy.typing import ArrayLike
+from expression_parser.analyzer.tree_nodes import Node
+from .program import Program, EvaluationException, get_program, get_variables
+from .buffer_planner import CHUNK_ELEMENTS, plan_program_buffers
+
+
+MIN_ROWS_PER_TASK = 1 << 16
+
+ArraySpec = tuple[str, tuple[int, ...], str]
+
+
+def evaluate_parallel(
+  tree: Node,
+  bindings: Mapping[str, ArrayLike],
+  workers: (int | None) = None,
+  rows_per_task: (int | None) = None,
+  executor: (Executor | None) = None,
+  seed: (int | None) = None,
+) -> np.ndarray:
+  program = get_program(tree)
+  arrays = dict()
+  for v in get_variables(program):
+    if v not in bindings: raise EvaluationException('Unbound variable "{symbol}"', v)
+    arrays[v] = np.asarray(bindings[v])
+  shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+  if not shape or shape[0] == 0:
+    return plan_program_buffers(program).evaluate(arrays, rng=np.random.default_rng(seed))
+  workers = workers or os.cpu_count() or 1
+  rows = rows_per_task or max(MIN_ROWS_PER_TASK, -(-shape[0] // workers))
+  tasks = [(start, min(start + rows, shape[0])) for start in range(0, shape[0], rows)]
+  seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+  with ExitStack() as stack:
+    inputs = {v: __share(a, stack) for v, a in arrays.items()}
+    output_memory = __allocate(int(np.prod(shape)) * np.dtype(np.float64).itemsize, stack)
+    output: ArraySpec = (output_memory.name, shape, np.dtype(np.float64).str)
+    if executor is None: executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+    futures = [
+      executor.submit(evaluate_shared_rows, program, inputs, output, start, end, task_seed)
+      for (start, end), task_seed in zip(tasks, seeds)
+    ]
+    for f in futures: f.result()
+    return np.ndarray(shape, dtype=np.float64, buffer=output_memory.buf).copy()
+
+
+def evaluate_shared_rows(
+  program: Program,
+  inputs: dict[str, ArraySpec],
+  output: ArraySpec,
+  start: int,
+  end: int,
+  seed: np.random.SeedSequence,
+):
+  with ExitStack() as stack:
+    shape = output[1]
+    arrays = {v: np.broadcast_to(__attach(spec, stack), shape)[start:end] for v, spec in inputs.items()}
+    out = __attach(output, stack)[start:end]
+    plan_program_buffers(program).evaluate(arrays, out, CHUNK_ELEMENTS, np.random.default_rng(seed))
+    del arrays, out
+
+
+def __share(array: np.ndarray, stack: ExitStack) -> ArraySpec:
+  memory = __allocate(array.nbytes, stack)
+  shared = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+  shared[...] = array
+  del shared
+  return memory.name, array.shape, array.dtype.str
+
+
+def __allocate(size: int, stack: ExitStack) -> SharedMemory:
+  memory = SharedMemory(create=True, size=max(size, 1))
+  stack.callback(memory.unlink)
+  stack.callback(memory.close)
+  return memory
+
+
+def __attach(spec: ArraySpec, stack: ExitStack) -> np.ndarray:
+  name, shape, dtype = spec
+  memory = SharedMemory(name=name)
+  stack.callback(memory.close)
+  return np.ndarray(shape, dtype=np.dtype(dtype), buffer=memory.buf)
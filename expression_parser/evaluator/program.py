@@ -0,0 +1,54 @@
+from expression_parser.parser.symbol_table import get_number
+from expression_parser.analyzer.tree_nodes import Node, UnaryOperatorNode, BinaryOperatorNode, FunctionNode
+from expression_parser.analyzer.flat_tree import Opcode
+from expression_parser.analyzer.frozen_nodes import FrozenNode, FrozenUnaryOperatorNode, FrozenBinaryOperatorNode, FrozenFunctionNode
+
+
+Instruction = tuple[int, str, int]
+Program = tuple[Instruction, ...]
+
+UNARY_NODES = frozenset((UnaryOperatorNode, FrozenUnaryOperatorNode))
+BINARY_NODES = frozenset((BinaryOperatorNode, FrozenBinaryOperatorNode))
+FUNCTION_NODES = frozenset((FunctionNode, FrozenFunctionNode))
+
+
+class EvaluationException(Exception):
+  def __init__(self, message: str, symbol: str):
+    super().__init__(message.format(symbol=symbol))
+    self.__message: str = message
+    self.symbol: str = symbol
+
+
+  def __reduce__(self):
+    return EvaluationException, (self.__message, self.symbol)
+
+
+def get_program(tree: (Node | FrozenNode)) -> Program:
+  if tree.value is None:
+    raise EvaluationException('Empty expression cannot be evaluated', str())
+  program: list[Instruction] = list()
+  stack: list[tuple[(Node | FrozenNode), bool]] = [(tree, False)]
+  while stack:
+    node, visited = stack.pop()
+    node_type = type(node)
+    if visited and node_type in BINARY_NODES:
+      program.append((Opcode.BINARY.value, node.value.value, 2))
+    elif visited and node_type in UNARY_NODES:
+      program.append((Opcode.UNARY.value, node.value.value, 1))
+    elif visited:
+      program.append((Opcode.FUNCTION.value, node.value.value, len(node.args)))
+    elif node_type in BINARY_NODES:
+      stack.extend(((node, True), (node.right, False), (node.left, False)))
+    elif node_type in UNARY_NODES:
+      stack.extend(((node, True), (node.expression, False)))
+    elif node_type in FUNCTION_NODES:
+      stack.append((node, True))
+      stack.extend((arg, False) for arg in reversed(node.args))
+    else:
+      program.append((Opcode.LEAF.value, node.value.value, 0))
+  return tuple(program)
+
+
+def get_variables(program: Program) -> tuple[str, ...]:
+  variables = dict.fromkeys(v for op, v, _ in program if op == Opcode.LEAF and get_number(v) is None)
+  return tuple(variables)
@@ -0,0 +1,109 @@
+from functools import lru_cache
+from typing import Mapping
+import numpy as np
+from numpy.typing import ArrayLike
+from expression_parser.parser.tokens import Operator
+from expression_parser.parser.symbol_table import get_number
+from expression_parser.analyzer.tree_nodes import Node
+from expression_parser.analyzer.flat_tree import Opcode
+from expression_parser.analyzer.frozen_nodes import FrozenNode, freeze
+from .program import Program, EvaluationException, get_program, get_variables
+
+
+BINARY_UFUNCS: dict[str, np.ufunc] = {
+  Operator.PLUS.value: np.add,
+  Operator.MINUS.value: np.subtract,
+  Operator.MULTIPLY.value: np.multiply,
+  Operator.DIVIDE.value: np.divide,
+  Operator.POWER.value: np.power,
+}
+
+UNARY_UFUNCS: dict[str, np.ufunc] = {
+  Operator.PLUS.value: np.positive,
+  Operator.MINUS.value: np.negative,
+}
+
+FUNCTION_UFUNCS: dict[str, np.ufunc] = dict(
+  sin=np.sin,
+  cos=np.cos,
+  max=np.maximum,
+  min=np.minimum,
+  pow=np.power,
+)
+
+RANDOM_FUNCTION = 'rand'
+FLOATING_POINT_ERRORS = dict(divide='raise', over='raise', invalid='raise')
+COMPILED_CACHE_SIZE = 256
+
+Step = tuple[int, np.ufunc | np.float64 | str | None, int]
+
+
+class VectorizedExpression:
+  def __init__(self, program: Program):
+    self.__variables: tuple[str, ...] = get_variables(program)
+    self.__steps: tuple[Step, ...] = tuple(VectorizedExpression.__get_step(*instruction) for instruction in program)
+
+
+  @staticmethod
+  def __get_step(opcode: int, value: str, arity: int) -> Step:
+    match opcode:
+      case Opcode.UNARY:
+        return opcode, UNARY_UFUNCS[value], arity
+      case Opcode.BINARY:
+        return opcode, BINARY_UFUNCS[value], arity
+      case Opcode.FUNCTION if value == RANDOM_FUNCTION:
+        return opcode, None, arity
+      case Opcode.FUNCTION:
+        return opcode, FUNCTION_UFUNCS[value], arity
+    number = get_number(value)
+    return opcode, np.float64(number) if number is not None else value, arity
+
+
+  def get_variables(self) -> tuple[str, ...]:
+    return self.__variables
+
+
+  def __call__(self, bindings: Mapping[str, ArrayLike], rng: (np.random.Generator | None) = None) -> np.ndarray:
+    arrays = dict()
+    for v in self.__variables:
+      if v not in bindings: raise EvaluationException('Unbound variable "{symbol}"', v)
+      arrays[v] = np.asarray(bindings[v], dtype=np.float64)
+    shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+    random = rng if rng else np.random.default_rng()
+    stack: list[np.ndarray | np.float64] = list()
+    try:
+      with np.errstate(**FLOATING_POINT_ERRORS):
+        for opcode, operation, arity in self.__steps:
+          match opcode:
+            case Opcode.LEAF:
+              stack.append(arrays[operation] if isinstance(operation, str) else operation)
+            case Opcode.FUNCTION if operation is None:
+              stack.append(random.random(shape))
+            case _:
+              args = stack[len(stack) - arity:]
+              del stack[-arity:]
+              stack.append(operation(*args))
+    except FloatingPointError as e:
+      raise EvaluationException('Arithmetic error: {symbol}', str(e)) from None
+    result = np.asarray(stack.pop(), dtype=np.float64)
+    if result.shape != shape or any(result is a for a in arrays.values()):
+      result = np.broadcast_to(result, shape).copy()
+    return result
+
+
+def evaluate_vectorized(tree: Node, bindings: Mapping[str, ArrayLike], rng: (np.random.Generator | None) = None) -> np.ndarray:
+  return compile_vectorized(tree)(bindings, rng)
+
+
+def compile_vectorized(tree: Node) -> VectorizedExpression:
+  return compile_frozen_vectorized(freeze(tree))
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def compile_frozen_vectorized(tree: FrozenNode) -> VectorizedExpression:
+  return compile_vectorized_program(get_program(tree))
+
+
+def compile_vectorized_program(program: Program) -> VectorizedExpression:
+  return VectorizedExpression(program)
+
@@ -1,105 +1,241 @@
-from typing import Callable
+import heapq
+from typing import Callable, NamedTuple
 from types import NoneType
-from copy import deepcopy
-from expression_parser.parser.tokens import Token, TokenType, Operator
+from expression_parser.parser.tokens import Operator
+from expression_parser.parser.symbol_table import intern_symbol
 from expression_parser.analyzer.tree_nodes import Node, FunctionNode, UnaryOperatorNode, BinaryOperatorNode
+from expression_parser.conveyor_simulation.utils import get_operation_duration
 from . import optimizer_tools
+from .pass_manager import PassManager, TreePass
 
 
-def build_parallel_tree(node: Node, convert_to_optimized: bool = True) -> Node:
-  tree = deepcopy(node)
-  if not tree.value: return tree
-  tree = optimizer_tools.minimize_redundant_nodes(tree)
+Cost = Callable[[Node], float]
+
+
+class Rebuilt(NamedTuple):
+  node: Node
+  latency: float
+  height: int
+  core: int
+  negative: bool
+  reciprocal: bool
+
+
+class Chain(NamedTuple):
+  operator: BinaryOperatorNode
+  operands: list[Node]
+  operators: list[BinaryOperatorNode]
+  postfix: list[bool]
+
+
+def build_parallel_tree(
+  node: Node,
+  convert_to_optimized: bool = True,
+  weighted: bool = False,
+  manager: (PassManager | NoneType) = None,
+) -> Node:
+  if manager is not None and (not convert_to_optimized or weighted):
+    raise ValueError('convert_to_optimized and weighted cannot be combined with a manager; configure its passes instead')
+  if not node.value: return optimizer_tools.copy_tree(node)
+  if manager is None: manager = PassManager(get_parallel_passes(convert_to_optimized, weighted))
+  return manager.run(node)
+
+
+def get_parallel_passes(convert_to_optimized: bool = True, weighted: bool = False) -> tuple[TreePass, ...]:
+  cost = get_operation_duration if weighted else None
+  passes = (
+    TreePass('copy_tree', optimizer_tools.copy_tree),
+    TreePass('fold_constants', optimizer_tools.fold_constants),
+    TreePass('minimize_redundant_nodes', optimizer_tools.minimize_redundant_nodes),
+    TreePass('convert_to_primitive', __convert_to_primitive),
+    TreePass('reduce_unaries', __reduce_unaries),
+    TreePass('open_brackets', optimizer_tools.open_brackets),
+    TreePass('rebalance_chains', lambda tree: rebalance_chains(tree, cost, convert_to_optimized)),
+    TreePass('convert_to_optimized', optimizer_tools.convert_to_optimized),
+  )
+  return passes if convert_to_optimized else passes[:-1]
+
+
+def rebalance_chains(node: Node, cost: (Cost | NoneType) = None, convert_to_optimized: bool = True) -> Node:
+  cost = cost if cost else __unit_cost
+  rebuilt: list[Rebuilt] = list()
+  stack: list[tuple[Node | Chain, int]] = [(node, -1)]
+  while stack:
+    current, count = stack.pop()
+    if count >= 0:
+      children = rebuilt[len(rebuilt) - count:] if count else list()
+      if count: del rebuilt[-count:]
+      if isinstance(current, Chain):
+        rebuilt.append(__build_chain(current, children, cost, convert_to_optimized))
+      else:
+        rebuilt.append(__rebuild_node(current, children, cost, convert_to_optimized))
+      continue
+    match current:
+      case BinaryOperatorNode() if current.value.value in (Operator.PLUS.value, Operator.MULTIPLY.value):
+        chain = __flatten_chain(current)
+        operands = chain.operands
+        stack.append((chain, len(operands)))
+      case BinaryOperatorNode():
+        operands = [current.left, current.right]
+        stack.append((current, 2))
+      case UnaryOperatorNode():
+        operands = [current.expression]
+        stack.append((current, 1))
+      case FunctionNode():
+        operands = list(current.args)
+        stack.append((current, len(operands)))
+      case _:
+        rebuilt.append(__rebuild_node(current, list(), cost, convert_to_optimized))
+        continue
+    stack.extend((operand, -1) for operand in reversed(operands))
+  return rebuilt.pop().node
+
+
+def __convert_to_primitive(tree: Node) -> Node:
   optimizer_tools.convert_to_primitive(tree)
+  return tree
+
+
+def __reduce_unaries(tree: Node) -> Node:
   tree, unary = optimizer_tools.get_unary_min_depth(tree)
   if unary:
     unary.expression = tree
     tree = unary
   optimizer_tools.reduce_unaries(tree)
-  tree = optimizer_tools.open_brackets(tree)
-  minimize_depth(tree)
-  if convert_to_optimized:
-    tree = optimizer_tools.convert_to_optimized(tree)
   return tree
 
 
-def minimize_depth(node: Node):
+def __flatten_chain(node: BinaryOperatorNode) -> Chain:
+  chain = Chain(node, list(), list(), list())
+  stack: list[tuple[Node, bool]] = [(node, False)]
+  while stack:
+    current, visited = stack.pop()
+    if not __is_chain_operator(chain, current):
+      chain.operands.append(current)
+      chain.postfix.append(False)
+    elif visited:
+      chain.operators.append(current)
+      chain.postfix.append(True)
+    else:
+      stack.extend(((current, True), (current.right, False), (current.left, False)))
+  return chain
+
+
+def __is_chain_operator(chain: Chain, node: Node) -> bool:
+  return isinstance(node, BinaryOperatorNode) and node.value.value == chain.operator.value.value
+
+
+def __build_chain(chain: Chain, operands: list[Rebuilt], cost: Cost, convert_to_optimized: bool) -> Rebuilt:
+  weighted = cost is not __unit_cost
+  product = chain.operator.value.value == Operator.MULTIPLY.value
+  step = cost(chain.operator)
+  heights = [operand.core if product else __get_sum_height(operand) for operand in operands]
+  latencies = [operand.latency for operand in operands]
+
+  original_latency, original_height = __get_original_shape(chain, latencies, heights, step)
+  depths, latency, height = __get_balanced_depths(latencies, heights, step, weighted)
+  original = __rank(weighted, original_latency, original_height) <= __rank(weighted, latency, height)
+  if original:
+    node, latency, height = __link_original(chain, operands), original_latency, original_height
+  else:
+    node = __link_balanced(chain, operands, depths)
+  if not convert_to_optimized: return Rebuilt(node, latency, height, height, False, False)
+  if not product:
+    negative = all(operand.negative and not operand.reciprocal for operand in operands)
+    return Rebuilt(node, latency, height + negative, height, negative, False)
+  negative = sum(operand.negative for operand in operands) % 2 == 1
+  reciprocal = all(operand.reciprocal for operand in operands)
+  return Rebuilt(node, latency, height + negative + reciprocal, height, negative, reciprocal)
+
+
+def __get_sum_height(operand: Rebuilt) -> int:
+  return operand.core if operand.negative and not operand.reciprocal else operand.height
+
+
+def __get_original_shape(chain: Chain, latencies: list[float], heights: list[int], step: float) -> tuple[float, int]:
+  stack: list[tuple[float, int]] = list()
+  operands = iter(zip(latencies, heights))
+  for is_operator in chain.postfix:
+    if not is_operator:
+      stack.append(next(operands))
+      continue
+    (left_latency, left_height), (right_latency, right_height) = stack[-2:]
+    stack[-2:] = [(max(left_latency, right_latency) + step, max(left_height, right_height) + 1)]
+  return stack[0]
+
+
+def __get_balanced_depths(latencies: list[float], heights: list[int], step: float, weighted: bool) -> tuple[list[int], float, int]:
+  count = len(latencies)
+  latencies, heights, positions, parents = list(latencies), list(heights), list(range(count)), [-1] * count
+  heap = [(__rank(weighted, latencies[i], heights[i]), i, i) for i in range(count)]
+  heapq.heapify(heap)
+  while len(heap) > 1:
+    _, _, left = heapq.heappop(heap)
+    _, _, right = heapq.heappop(heap)
+    merged = len(parents)
+    parents[left] = parents[right] = merged
+    parents.append(-1)
+    latencies.append(max(latencies[left], latencies[right]) + step)
+    heights.append(max(heights[left], heights[right]) + 1)
+    positions.append(min(positions[left], positions[right]))
+    heapq.heappush(heap, (__rank(weighted, latencies[merged], heights[merged]), positions[merged], merged))
+  root = len(parents) - 1
+  depths = [0] * len(parents)
+  for i in reversed(range(root)): depths[i] = depths[parents[i]] + 1
+  return depths[:count], latencies[root], heights[root]
+
+
+def __link_original(chain: Chain, operands: list[Rebuilt]) -> Node:
+  stack: list[Node] = list()
+  nodes = iter(operand.node for operand in operands)
+  operators = iter(chain.operators)
+  for is_operator in chain.postfix:
+    if not is_operator:
+      stack.append(next(nodes))
+      continue
+    operator = next(operators)
+    operator.left, operator.right = stack[-2:]
+    stack[-2:] = [operator]
+  return stack[0]
+
+
+def __link_balanced(chain: Chain, operands: list[Rebuilt], depths: list[int]) -> Node:
+  stack: list[tuple[Node, int]] = list()
+  operators = iter(chain.operators)
+  for i in sorted(range(len(operands)), key=lambda i: (-depths[i], i)):
+    stack.append((operands[i].node, depths[i]))
+    while len(stack) > 1 and stack[-1][1] == stack[-2][1]:
+      (left, depth), (right, _) = stack[-2:]
+      operator = next(operators)
+      operator.left, operator.right = left, right
+      stack[-2:] = [(operator, depth - 1)]
+  return stack[0][0]
+
+
+def __rank(weighted: bool, latency: float, height: int) -> tuple[float, float]:
+  return (latency, height) if weighted else (height, latency)
+
+
+def __rebuild_node(node: Node, children: list[Rebuilt], cost: Cost, convert_to_optimized: bool) -> Rebuilt:
+  match node:
+    case BinaryOperatorNode():
+      node.left, node.right = (child.node for child in children)
+    case UnaryOperatorNode():
+      node.expression = children[0].node
+    case FunctionNode():
+      node.args = tuple(child.node for child in children)
+  latency = cost(node) + max((child.latency for child in children), default=0)
+  height = 1 + max((child.height for child in children), default=0)
+  if not convert_to_optimized: return Rebuilt(node, latency, height, height, False, False)
   match node:
-    case UnaryOperatorNode() as unary:
-      minimize_depth(unary.expression)
-    case BinaryOperatorNode() as binary if binary.value.value in (Operator.PLUS.value, Operator.MULTIPLY.value):
-      operator = binary.value.value
-      depth_builder = lambda node, depth: get_path_depth(node, depth, operator)
-      balance_operator(operator, binary, depth_builder)
-    case BinaryOperatorNode(value=(Token(value=Operator.POWER.value))) as power:
-      minimize_depth(power.left)
-      minimize_depth(power.right)
-    case FunctionNode() as function:
-      for expression in function.args:
-        minimize_depth(expression)
-
-
-def balance_operator(operator: str, node: BinaryOperatorNode, depth_builder: Callable[[Node, list[Node]], NoneType]):
-  max_path, min_path = get_leaves_path(node, depth_builder)
-  max_len = len(max_path)
-  min_len = len(min_path)
-  if max_len != min_len and max_len > 2:
-    joinable, prev, replaceable = tuple(max_path[-3:])
-    leaf_left = 'left' if prev.right is replaceable else 'right'
-    leaf_to_place = 'left' if joinable.left is prev  else 'right'
-    setattr(joinable, leaf_to_place, getattr(prev, leaf_left))
-
-    prev, groupable = tuple(min_path[-2:])
-    leaf_to_add = 'left' if prev.left is groupable else 'right'
-    grouped = BinaryOperatorNode(
-      value=Token.of(operator, TokenType.OPERATOR, groupable.value.start),
-      left=replaceable,
-      right=groupable,
-    )
-    setattr(prev, leaf_to_add, grouped)
-
-  minimize_depth(node.left)
-  minimize_depth(node.right)
-
-
-def get_path_depth(node: Node, depth: list[Node], operator: str):
-  is_binary = isinstance(node, BinaryOperatorNode)
-  if not is_binary or is_binary and node.value.value != operator:
-    depth.append(node)
-    return
-  binary: BinaryOperatorNode = node
-  left_operator = binary.left.value.value == operator
-  right_operator = binary.right.value.value == operator
-  if left_operator and right_operator:
-    depth_warapper = lambda node, depth: get_path_depth(node, depth, operator)
-    max_path, _ = get_leaves_path(binary, depth_warapper)
-    depth.extend(max_path)
-    return
-  depth.append(binary)
-  if left_operator and not right_operator:
-    get_path_depth(binary.right, depth, operator)
-  elif right_operator and not left_operator:
-    get_path_depth(binary.left, depth, operator)
-  elif not (left_operator or right_operator):
-    binary_left = isinstance(binary.left, BinaryOperatorNode)
-    binary_right = isinstance(binary.right, BinaryOperatorNode)
-    if binary_left and not binary_right:
-      depth.append(binary.right)
-    elif binary_right and not binary_left:
-      depth.append(binary.left)
-    elif binary_left and binary_right:
-      left_warapper = lambda node, depth: get_path_depth(node, depth, binary.left.value.value)
-      max_left, _ = get_leaves_path(binary.left, left_warapper)
-      right_warapper = lambda node, depth: get_path_depth(node, depth, binary.right.value.value)
-      max_right, _ = get_leaves_path(binary.right, right_warapper)
-      shortest = max_left[0] if len(max_left) > len(max_right) else max_right[0]
-      depth.append(shortest)
-
-
-def get_leaves_path(node: BinaryOperatorNode, depth_builder: Callable[[Node, list[Node]], NoneType]) -> tuple[list[Node], list[Node]]:
-  left_depth: list[Node] = [node]
-  right_depth: list[Node] = [node]
-  depth_builder(node.left, left_depth)
-  depth_builder(node.right, right_depth)
-  left_max = len(left_depth) > len(right_depth)
-  return (left_depth, right_depth) if left_max else (right_depth, left_depth)
+    case UnaryOperatorNode():
+      return Rebuilt(node, latency, height, height - 1, True, False)
+    case BinaryOperatorNode() if node.value.value == Operator.DIVIDE.value and intern_symbol(node.left.value) == optimizer_tools.ONE:
+      denominator = children[1]
+      negative = denominator.negative and not denominator.reciprocal
+      return Rebuilt(node, latency, height, denominator.core if negative else denominator.height, negative, True)
+  return Rebuilt(node, latency, height, height, False, False)
+
+
+def __unit_cost(node: Node) -> float:
+  return 1
@@ -1,81 +1,166 @@
+import math
+import sys
 from copy import deepcopy
+from decimal import Decimal
 from types import NoneType
-from expression_parser.parser.tokens import Token, TokenType, Operator
-from expression_parser.analyzer.tree_nodes import Node, FunctionNode, UnaryOperatorNode, BinaryOperatorNode
+from typing import Callable, Generator
+from expression_parser.parser.tokens import Token, TokenType, Operator, Signature
+from expression_parser.parser.symbol_table import SYMBOLS, intern_symbol, get_number
+from expression_parser.analyzer.tree_nodes import Node, NodesTuple, FunctionNode, UnaryOperatorNode, BinaryOperatorNode, fold_tree
+
+
+FOLDABLE_FUNCTIONS: dict[str, Callable[..., int | float]] = dict(
+  sin=math.sin,
+  cos=math.cos,
+  max=max,
+  min=min,
+)
+
+MAX_EXACT_FLOAT_INTEGER = 1 << 53
+
+ZERO: int = SYMBOLS.add('0')
+ONE: int = SYMBOLS.add('1')
+MINUS: int = SYMBOLS.add(Operator.MINUS.value)
+DIVIDE: int = SYMBOLS.add(Operator.DIVIDE.value)
+
+Frame = Generator['Frame', (Node | NoneType), (Node | NoneType)]
+
+
+def fold_constants(node: Node) -> Node:
+  return fold_tree(node, __fold_node)
+
+
+def copy_tree(node: Node) -> Node:
+  tokens: dict[int, Token] = dict()
+  copy_token = lambda token: tokens.setdefault(id(token), Token(token.type, token.value, token.start, token.end)) if token else token
+
+  def copy_node(current: Node, copied: NodesTuple) -> Node:
+    match current:
+      case UnaryOperatorNode():
+        return UnaryOperatorNode(value=copy_token(current.value), expression=copied[0])
+      case BinaryOperatorNode():
+        return BinaryOperatorNode(value=copy_token(current.value), left=copied[0], right=copied[1])
+      case FunctionNode():
+        return FunctionNode(value=copy_token(current.value), args=copied)
+    return Node(value=copy_token(current.value))
+
+  return fold_tree(node, copy_node)
 
 
 def minimize_redundant_nodes(node: Node) -> Node:
+  return __run(__minimize_redundant_nodes(node))
+
+
+def convert_to_primitive(node: Node):
+  __run(__convert_to_primitive(node))
+
+
+def reduce_unaries(node: Node):
+  __run(__reduce_unaries(node))
+
+
+def get_unary_min_depth(node: Node) -> tuple[Node, (UnaryOperatorNode | NoneType)]:
+  if not isinstance(node, UnaryOperatorNode):
+    return node, None
+  unary = node
+  minus: bool = unary.value.value == Operator.MINUS.value
+  current_node = node
+  while True:
+    current_node = current_node.expression
+    if not isinstance(current_node, UnaryOperatorNode): break
+    if current_node.value.value == Operator.MINUS.value:
+      minus = not minus
+      unary = current_node
+  if not minus: unary = None
+  return current_node, unary
+
+
+def open_brackets(node: Node) -> Node:
+  return __run(__open_brackets(node))
+
+
+def apply_minus(node: Node) -> Node:
+  return __run(__apply_minus(node))
+
+
+def convert_to_optimized(node: Node) -> Node:
+  return __run(__convert_to_optimized(node))
+
+
+# passes
+
+def __minimize_redundant_nodes(node: Node, minimized: bool = False) -> Frame:
   match node:
     case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))) if __is_primitive(node.left) and __vals_eq(node.left, node.right):
       return Node(value=Token.of('0', TokenType.CONSTANT, node.value.start))
-    case BinaryOperatorNode(value=(Token(value=Operator.PLUS.value))) if __vals_eq(node.left, '0'):
-      return minimize_redundant_nodes(node.right)
-    case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))) if __vals_eq(node.left, '0'):
+    case BinaryOperatorNode(value=(Token(value=Operator.PLUS.value))) if __vals_eq(node.left, ZERO):
+      return (yield __minimize_redundant_nodes(node.right, minimized))
+    case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))) if __vals_eq(node.left, ZERO):
       token = Token.of(Operator.MINUS.value, TokenType.OPERATOR, node.value.start)
       unary = UnaryOperatorNode(value=token, expression=node.right)
-      return minimize_redundant_nodes(unary)
-    case BinaryOperatorNode() if node.value.value in (Operator.PLUS.value, Operator.MINUS.value) and __vals_eq(node.right, '0'):
-      return minimize_redundant_nodes(node.left)
-    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.left, '1'):
-      return minimize_redundant_nodes(node.right)
-    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.right, '1'):
-      return minimize_redundant_nodes(node.left)
-    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.left, '0'):
+      return (yield __minimize_redundant_nodes(unary, minimized))
+    case BinaryOperatorNode() if node.value.value in (Operator.PLUS.value, Operator.MINUS.value) and __vals_eq(node.right, ZERO):
+      return (yield __minimize_redundant_nodes(node.left, minimized))
+    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.left, ONE):
+      return (yield __minimize_redundant_nodes(node.right, minimized))
+    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.right, ONE):
+      return (yield __minimize_redundant_nodes(node.left, minimized))
+    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.left, ZERO):
       return node.left
-    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.right,'0'):
+    case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))) if __vals_eq(node.right, ZERO):
       return node.right
-    case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))) if __vals_eq(node.right, '1'):
-      return minimize_redundant_nodes(node.left)
-    case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))) if __vals_eq(node.left, '0'):
-      return node if __vals_eq(node.right, '0') else node.left
-    case UnaryOperatorNode() if __vals_eq(node.expression, '0'):
+    case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))) if __vals_eq(node.right, ONE):
+      return (yield __minimize_redundant_nodes(node.left, minimized))
+    case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))) if __vals_eq(node.left, ZERO):
+      return node if __vals_eq(node.right, ZERO) else node.left
+    case UnaryOperatorNode() if __vals_eq(node.expression, ZERO):
       return node.expression
     case UnaryOperatorNode():
-      node.expression = minimize_redundant_nodes(node.expression)
-      return node.expression if __vals_eq(node.expression, '0') else node
+      node.expression = yield __minimize_redundant_nodes(node.expression, minimized)
+      return node.expression if __vals_eq(node.expression, ZERO) else node
+    case BinaryOperatorNode() if minimized:
+      return node
     case BinaryOperatorNode():
       left = node.left.value
       right = node.right.value
-      node.left = minimize_redundant_nodes(node.left)
-      node.right = minimize_redundant_nodes(node.right)
-      minimized = left != node.left.value or right != node.right.value
-      return minimize_redundant_nodes(node) if minimized else node
+      node.left = yield __minimize_redundant_nodes(node.left)
+      node.right = yield __minimize_redundant_nodes(node.right)
+      changed = left != node.left.value or right != node.right.value
+      return (yield __minimize_redundant_nodes(node, True)) if changed else node
     case FunctionNode():
-      node.args = tuple(minimize_redundant_nodes(arg) for arg in node.args)
-      return node
-    case Node() if node.value.type in (TokenType.CONSTANT, TokenType.VARIABLE):
-      return node
-    case _:
-      return minimize_redundant_nodes(node)
+      args = list()
+      for arg in node.args: args.append((yield __minimize_redundant_nodes(arg, minimized)))
+      node.args = tuple(args)
+  return node
 
 
-def convert_to_primitive(node: Node):
+def __convert_to_primitive(node: Node) -> Frame:
   match node:
     case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))) as minus:
-      convert_to_primitive(minus.left)
-      convert_to_primitive(minus.right)
+      yield __convert_to_primitive(minus.left)
+      yield __convert_to_primitive(minus.right)
       right_wrapper = Token.of(Operator.MINUS.value, TokenType.OPERATOR, minus.right.value.start)
       minus.value.value = Operator.PLUS.value
       minus.right = UnaryOperatorNode(value=right_wrapper, expression=minus.right)
     case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))) as division:
-      convert_to_primitive(division.left)
-      convert_to_primitive(division.right)
+      yield __convert_to_primitive(division.left)
+      yield __convert_to_primitive(division.right)
       right_leaf_start = division.right.value.start
       one_constant = Token.of('1', TokenType.CONSTANT, right_leaf_start)
       division_by_one = Token.of(Operator.DIVIDE.value, TokenType.OPERATOR, right_leaf_start)
       division.value.value = Operator.MULTIPLY.value
       division.right = BinaryOperatorNode(value=division_by_one, left=Node(one_constant), right=division.right)
     case BinaryOperatorNode() as operation if operation.value.value in (Operator.PLUS.value, Operator.MULTIPLY.value, Operator.POWER.value):
-      convert_to_primitive(operation.left)
-      convert_to_primitive(operation.right)
+      yield __convert_to_primitive(operation.left)
+      yield __convert_to_primitive(operation.right)
     case UnaryOperatorNode() as unary:
-      convert_to_primitive(unary.expression)
+      yield __convert_to_primitive(unary.expression)
     case FunctionNode() as function:
       for expression in function.args:
-        convert_to_primitive(expression)
+        yield __convert_to_primitive(expression)
 
 
-def reduce_unaries(node: Node):
+def __reduce_unaries(node: Node) -> Frame:
   match node:
     case BinaryOperatorNode() as binary:
       for key in ('left', 'right'):
@@ -83,7 +168,7 @@ def reduce_unaries(node: Node):
         expression, unary = get_unary_min_depth(leaf)
         if unary: unary.expression = expression
         setattr(binary, key, unary if unary else expression)
-        reduce_unaries(expression)
+        yield __reduce_unaries(expression)
     case FunctionNode() as function:
       args = list(function.args)
       for i in range(len(args)):
@@ -91,75 +176,68 @@ def reduce_unaries(node: Node):
         expression, unary = get_unary_min_depth(arg)
         if unary: unary.expression = expression
         args[i] = unary if unary else expression
-        reduce_unaries(expression)
+        yield __reduce_unaries(expression)
       function.args = tuple(args)
 
 
-def get_unary_min_depth(node: Node) -> tuple[Node, (UnaryOperatorNode | NoneType)]:
-  if not isinstance(node, UnaryOperatorNode):
-    return node, None
-  unary = node
-  minus: bool = unary.value.value == Operator.MINUS.value
-  current_node = node
-  while True:
-    current_node = current_node.expression
-    if not isinstance(current_node, UnaryOperatorNode): break
-    if current_node.value.value == Operator.MINUS.value:
-      minus = not minus
-      unary = current_node
-  if not minus: unary = None
-  return current_node, unary
-
-
-def open_brackets(node: Node) -> Node:
+def __open_brackets(node: Node) -> Frame:
   match node:
     case UnaryOperatorNode():
       expression = node.expression
-      node = apply_minus(expression)
+      node = yield __apply_minus(expression)
     case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))):
       node.value.value = Operator.PLUS.value
-      node.left = open_brackets(node.left)
-      node.right = apply_minus(node.right)
+      node.left = yield __open_brackets(node.left)
+      node.right = yield __apply_minus(node.right)
     case BinaryOperatorNode():
-      node.left = open_brackets(node.left)
-      node.right = open_brackets(node.right)
+      node.left = yield __open_brackets(node.left)
+      node.right = yield __open_brackets(node.right)
     case FunctionNode():
-      node.args = tuple(open_brackets(expr) for expr in node.args)
+      args = list()
+      for expr in node.args: args.append((yield __open_brackets(expr)))
+      node.args = tuple(args)
   return node
-        
 
-def apply_minus(node: Node) -> Node:
+
+def __apply_minus(node: Node) -> Frame:
   match node:
     case UnaryOperatorNode():
-      node = open_brackets(node.expression)
+      node = yield __open_brackets(node.expression)
     case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))):
       node.value.value = Operator.PLUS.value
     case BinaryOperatorNode(value=(Token(value=Operator.PLUS.value))):
-      node.left = apply_minus(open_brackets(node.left))
-      node.right = apply_minus(open_brackets(node.right))
+      node.left = yield __apply_minus((yield __open_brackets(node.left)))
+      node.right = yield __apply_minus((yield __open_brackets(node.right)))
     case BinaryOperatorNode() if node.value.value in (Operator.MULTIPLY.value, Operator.DIVIDE.value):
-      node.left = open_brackets(node.left)
-      node.right = open_brackets(node.right)
-      leaf_minus = 'right' if __vals_eq(node.left, '1') else 'left'
-      setattr(node, leaf_minus, apply_minus(getattr(node, leaf_minus)))
+      node.left = yield __open_brackets(node.left)
+      node.right = yield __open_brackets(node.right)
+      leaf_minus = 'right' if __vals_eq(node.left, ONE) else 'left'
+      setattr(node, leaf_minus, (yield __apply_minus(getattr(node, leaf_minus))))
     case Node():
       node = UnaryOperatorNode(
         value=Token.of(Operator.MINUS.value, TokenType.OPERATOR, node.value.start),
-        expression=open_brackets(node),
+        expression=(yield __open_brackets(node)),
       )
   return node
 
 
-def convert_to_optimized(node: Node) -> Node:
+def __convert_to_optimized(node: Node) -> Frame:
   match node:
+    case UnaryOperatorNode():
+      node.expression = yield __convert_to_optimized(node.expression)
+    case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))):
+      node.left = yield __convert_to_optimized(node.left)
+      node.right = yield __convert_to_optimized(node.right)
     case FunctionNode():
-      node.args = tuple(convert_to_optimized(arg) for arg in node.args)
+      args = list()
+      for arg in node.args: args.append((yield __convert_to_optimized(arg)))
+      node.args = tuple(args)
     case BinaryOperatorNode(value=(Token(value=Operator.POWER.value))):
-      node.left = convert_to_optimized(node.left)
-      node.right = convert_to_optimized(node.right)
+      node.left = yield __convert_to_optimized(node.left)
+      node.right = yield __convert_to_optimized(node.right)
     case BinaryOperatorNode(value=(Token(value=Operator.PLUS.value))):
-      node.left = convert_to_optimized(node.left)
-      node.right = convert_to_optimized(node.right)
+      node.left = yield __convert_to_optimized(node.left)
+      node.right = yield __convert_to_optimized(node.right)
       left_minus = isinstance(node.left, UnaryOperatorNode)
       right_minus = isinstance(node.right, UnaryOperatorNode)
       if left_minus and right_minus:
@@ -178,8 +256,8 @@ def convert_to_optimized(node: Node) -> Node:
         node.left = node.right
         node.right = left
     case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))):
-      node.left = convert_to_optimized(node.left)
-      node.right = convert_to_optimized(node.right)
+      node.left = yield __convert_to_optimized(node.left)
+      node.right = yield __convert_to_optimized(node.right)
       left_denominator = __get_denominator(node.left)
       right_denominator = __get_denominator(node.right)
       if left_denominator and not right_denominator:
@@ -189,7 +267,7 @@ def convert_to_optimized(node: Node) -> Node:
         node = __remove_redundant_minuses(node)
       elif not left_denominator and right_denominator:
         node.value.value = Operator.DIVIDE.value
-        node.right = convert_to_optimized(right_denominator)
+        node.right = right_denominator
         node = __remove_redundant_minuses(node)
       elif left_denominator and right_denominator:
         denominator_operator = deepcopy(node.value)
@@ -208,9 +286,112 @@ def convert_to_optimized(node: Node) -> Node:
 
 # utils
 
+def __run(frame: Frame) -> (Node | NoneType):
+  frames: list[Frame] = [frame]
+  result = None
+  while frames:
+    try:
+      frames.append(frames[-1].send(result))
+      result = None
+    except StopIteration as stop:
+      frames.pop()
+      result = stop.value
+  return result
+
+
+def __fold_node(node: Node, operands: NodesTuple) -> Node:
+  match node:
+    case UnaryOperatorNode():
+      node.expression = operands[0]
+    case BinaryOperatorNode():
+      node.left, node.right = operands
+    case FunctionNode():
+      node.args = operands
+    case _:
+      return node
+  return __fold_operation(node, operands)
+
+
+def __fold_operation(node: Node, operands: tuple[Node, ...]) -> Node:
+  if __vals_eq(node, MINUS) and isinstance(node, UnaryOperatorNode) and __is_constant(node.expression):
+    return node
+  numbers = tuple(__get_number(operand) for operand in operands)
+  if any(number is None for number in numbers): return node
+  result = __compute(node, numbers)
+  if result is None: return node
+  constant = Node(value=Token.of(__format_number(abs(result)), TokenType.CONSTANT, node.value.start))
+  if result >= 0: return constant
+  return UnaryOperatorNode(
+    value=Token.of(Operator.MINUS.value, TokenType.OPERATOR, node.value.start),
+    expression=constant,
+  )
+
+
+def __compute(node: Node, args: tuple[int | float, ...]) -> (int | float | NoneType):
+  operator = node.value.value
+  try:
+    match node:
+      case UnaryOperatorNode():
+        result = -args[0] if operator == Operator.MINUS.value else args[0]
+      case BinaryOperatorNode(value=(Token(value=Operator.PLUS.value))):
+        result = args[0] + args[1]
+      case BinaryOperatorNode(value=(Token(value=Operator.MINUS.value))):
+        result = args[0] - args[1]
+      case BinaryOperatorNode(value=(Token(value=Operator.MULTIPLY.value))):
+        result = args[0] * args[1]
+      case BinaryOperatorNode(value=(Token(value=Operator.DIVIDE.value))):
+        result = __divide(*args)
+      case BinaryOperatorNode(value=(Token(value=Operator.POWER.value))):
+        result = __power(*args)
+      case FunctionNode(value=(Token(value='pow'))):
+        result = __power(*args)
+      case FunctionNode() if operator in FOLDABLE_FUNCTIONS:
+        result = FOLDABLE_FUNCTIONS[operator](*args)
+      case _:
+        return None
+  except (ArithmeticError, ValueError):
+    return None
+  if isinstance(result, int): return result if abs(result) <= sys.float_info.max else None
+  if not math.isfinite(result): return None
+  return int(result) if result.is_integer() and abs(result) < MAX_EXACT_FLOAT_INTEGER else result
+
+
+def __divide(left: int | float, right: int | float) -> (int | float):
+  if isinstance(left, int) and isinstance(right, int) and right and left % right == 0:
+    return left // right
+  return left / right
+
+
+def __power(base: int | float, exponent: int | float) -> (int | float):
+  if not isinstance(base, int) or not isinstance(exponent, int) or exponent < 0:
+    return math.pow(base, exponent)
+  if exponent * (abs(base).bit_length() - 1) > sys.float_info.max_exp:
+    raise OverflowError('Folded power is out of range')
+  return base ** exponent
+
+
+def __get_number(node: Node) -> (int | float | NoneType):
+  if __is_constant(node):
+    return get_number(node.value.value)
+  if isinstance(node, UnaryOperatorNode) and __vals_eq(node, MINUS) and __is_constant(node.expression):
+    number = get_number(node.expression.value.value)
+    return None if number is None else -number
+  return None
+
+
+def __format_number(number: int | float) -> str:
+  if isinstance(number, int): return str(number)
+  text = format(Decimal(repr(number)), 'f')
+  return text if Signature.FLOAT_POINT in text else text + Signature.FLOAT_POINT + '0'
+
+
+def __is_constant(node: Node) -> bool:
+  return type(node) is Node and node.value.type == TokenType.CONSTANT
+
+
 def __get_denominator(node: BinaryOperatorNode) -> (Node | NoneType):
-  if not __vals_eq(node, Operator.DIVIDE.value): return None
-  if not __vals_eq(node.left, '1'): return None
+  if not __vals_eq(node, DIVIDE): return None
+  if not __vals_eq(node.left, ONE): return None
   return node.right
 
 
@@ -233,7 +414,7 @@ def __is_primitive(node: Node) -> bool:
   return node.value.type in (TokenType.CONSTANT, TokenType.VARIABLE)
 
 
-def __vals_eq(a: Node | str, b: Node | str) -> bool:
-  a = a.value.value if isinstance(a, Node) else a
-  b = b.value.value if isinstance(b, Node) else b
+def __vals_eq(a: Node | int, b: Node | int) -> bool:
+  a = intern_symbol(a.value) if isinstance(a, Node) else a
+  b = intern_symbol(b.value) if isinstance(b, Node) else b
   return a == b
@@ -0,0 +1,83 @@
+import tracemalloc
+from time import perf_counter
+from types import NoneType
+from typing import Callable, Iterable, NamedTuple
+from dataclasses import dataclass
+from expression_parser.analyzer.tree_nodes import Node, iter_postorder
+
+
+class TreePass(NamedTuple):
+  name: str
+  function: Callable[[Node], Node]
+
+
+@dataclass
+class PassStats:
+  name: str
+  seconds: float
+  nodes_before: int
+  nodes_after: int
+  allocated_bytes: int
+  peak_bytes: int
+
+  def format_params(self, round_digits: int = 7) -> str:
+    nodes = f'nodes = {self.nodes_before} -> {self.nodes_after}'
+    memory = f'allocated bytes = {self.allocated_bytes}; peak bytes = {self.peak_bytes}'
+    return f'{self.name}: seconds = {round(self.seconds, round_digits)}; {nodes}; {memory};'
+
+
+StatsCallback = Callable[[PassStats], NoneType]
+
+
+class PassManager:
+  def __init__(self, passes: Iterable[TreePass], instrument: bool = False, callback: (StatsCallback | NoneType) = None):
+    self.__passes: tuple[TreePass, ...] = tuple(passes)
+    self.__instrument: bool = instrument or callback is not None
+    self.__callback: (StatsCallback | NoneType) = callback
+    self.__stats: list[PassStats] = list()
+
+
+  def get_passes(self) -> tuple[TreePass, ...]:
+    return self.__passes
+
+
+  def get_stats(self) -> tuple[PassStats, ...]:
+    return tuple(self.__stats)
+
+
+  def without(self, *names: str) -> 'PassManager':
+    passes = (p for p in self.__passes if p.name not in names)
+    return PassManager(passes, self.__instrument, self.__callback)
+
+
+  def run(self, tree: Node) -> Node:
+    self.__stats.clear()
+    if not self.__instrument:
+      for tree_pass in self.__passes: tree = tree_pass.function(tree)
+      return tree
+    tracing = tracemalloc.is_tracing()
+    if not tracing: tracemalloc.start()
+    try:
+      for tree_pass in self.__passes:
+        tree = self.__run_instrumented(tree_pass, tree)
+    finally:
+      if not tracing: tracemalloc.stop()
+    return tree
+
+
+  def __run_instrumented(self, tree_pass: TreePass, tree: Node) -> Node:
+    nodes_before = count_nodes(tree)
+    tracemalloc.reset_peak()
+    memory_before, _ = tracemalloc.get_traced_memory()
+    start = perf_counter()
+    tree = tree_pass.function(tree)
+    seconds = perf_counter() - start
+    memory_after, peak = tracemalloc.get_traced_memory()
+    stats = PassStats(tree_pass.name, seconds, nodes_before, count_nodes(tree), memory_after - memory_before, peak - memory_before)
+    self.__stats.append(stats)
+    if self.__callback: self.__callback(stats)
+    return tree
+
+
+def count_nodes(tree: Node) -> int:
+  return sum(1 for _ in iter_postorder(tree))
@@ -0,0 +1,6 @@
+class ParsingExeprion(Exception):
+  def __init__(self, message: str, symbol: str, position: int):
+    super().__init__(message.format(symbol=symbol, position=position))
+    self.template: str = message
+    self.symbol: str = symbol
+    self.position: int = position
@@ -1,19 +1,19 @@
+from typing import Iterable, Iterator
 from .tokens import Token, Operator, TokenType, Signature, SymbolTemplate, functions_args
-
-
-class ParsingExeprion(Exception):
-  def __init__(self, message: str, symbol: str, position: int):
-    super().__init__(message.format(symbol=symbol, position=position))
-    self.symbol: str = symbol
-    self.position: int = position
+from .exceptions import ParsingExeprion
+from .expression_scanner import ExpressionScanner
+from .token_buffer import TokenBuffer
+from .symbol_table import SymbolTable, SYMBOLS, intern_symbol
 
 
 class ExpressionParser:
-  def __init__(self, expression: str):
+  def __init__(self, expression: str, max_errors: int = 0):
     self.__expression = expression
     self.__position: int = 0
     self.__tokens: list[Token] = list()
     self.__exceptions: list[ParsingExeprion] = list()
+    self.__exception_positions: set[int] = set()
+    self.__max_errors: int = max_errors
 
     self.__generate_tokens()
     for t in self.__tokens: t.value = t.value.strip()
@@ -28,9 +28,21 @@ class ExpressionParser:
   def get_exceptions(self) -> tuple[ParsingExeprion, ...]:
     return tuple(self.__exceptions)
 
+
+  def get_symbols(self) -> SymbolTable:
+    return SYMBOLS
+
+
+  @staticmethod
+  def parse_many(expressions: Iterable[str], max_errors: int = 0) -> Iterator[TokenBuffer]:
+    scanner = ExpressionScanner(max_errors=max_errors)
+    for expression in expressions:
+      scanner.scan(expression)
+      yield TokenBuffer.of(expression, scanner.get_tokens(), scanner.get_exceptions())
+
   
   def __generate_tokens(self):
-    while self.__position < len(self.__expression):
+    while self.__position < len(self.__expression) and not self.__is_failed():
       match self.__expression[self.__position]:
         case op if Operator.isop(op):
           self.__add_operator_token(op)
@@ -56,12 +68,17 @@ class ExpressionParser:
     return self.__tokens[-1] if len(self.__tokens) else None
 
   
+  def __is_failed(self) -> bool:
+    return 0 < self.__max_errors <= len(self.__exceptions)
+
+
   def __add_exeption(self, message: str, symbol: str, position: int = -1):
     pos = self.__position if position < 0 else position
+    if pos in self.__exception_positions or self.__is_failed(): return
     message_full = message + ' at position {position}'
-    if not tuple(filter(lambda e: e.position == pos, self.__exceptions)):
-      ex = ParsingExeprion(message_full, symbol, pos)
-      self.__exceptions.append(ex)
+    ex = ParsingExeprion(message_full, symbol, pos)
+    self.__exceptions.append(ex)
+    self.__exception_positions.add(pos)
 
 
   def __add_operator_token(self, operator: str):
@@ -192,22 +209,19 @@ class ExpressionParser:
   def __check_last_token(self):
     match self.__get_last_token():
       case Token() as t if t.type == TokenType.CONSTANT and t.value.strip() == Signature.FLOAT_POINT:
-        position = self.__expression.rindex(Signature.FLOAT_POINT)
-        self.__add_exeption('Invalid symbol "{symbol}"', t.value, position)
+        self.__add_exeption('Invalid symbol "{symbol}"', t.value, t.start)
       case Token(type=TokenType.DELIMITER) as t:
         if len(self.__tokens) > 1:
-          position = self.__expression.rindex(Signature.DELIMITER)
-          self.__add_exeption('Invalid symbol "{symbol}"', t.value, position)
+          self.__add_exeption('Invalid symbol "{symbol}"', t.value, t.start)
       case Token(type=TokenType.PARENTHESIS, value=Signature.LEFT_PARENTHESIS) as t:
-        position = self.__expression.rindex(t.value)
-        self.__add_exeption('Unexpected left parenthesis "{symbol}"', t.value, position)
+        self.__add_exeption('Unexpected left parenthesis "{symbol}"', t.value, t.start)
       case Token() as t if t.type == TokenType.OPERATOR:
         unary = Operator.isunary(t.value)
         if unary or len(self.__tokens) > 1 and not unary:
-          position = self.__expression.rindex(t.value)
-          self.__add_exeption('Unexpected symbol "{symbol}"', t.value, position)
+          self.__add_exeption('Unexpected symbol "{symbol}"', t.value, t.start)
 
 
   def __define_functions(self):
     for t in self.__tokens:
       if t.value in functions_args: t.type = TokenType.FUNCTION
+      intern_symbol(t)
@@ -0,0 +1,254 @@
+import re
+from typing import Iterable, Iterator, TextIO
+from .tokens import Token, Operator, TokenType, Signature, SymbolTemplate, functions_args
+from .exceptions import ParsingExeprion
+from .symbol_table import SymbolTable, SYMBOLS, intern_symbol
+
+
+CHUNK_SIZE = 1 << 16
+
+OPERATORS: frozenset[str] = frozenset(e.value for e in Operator)
+UNARY_OPERATORS: frozenset[str] = frozenset(e.value for e in (Operator.PLUS, Operator.MINUS))
+
+SCANNER_TEMPLATE: re.Pattern = re.compile('|'.join((
+  r'(?P<number>\d+(?:\.\d*)?|\.\d*)',
+  r'(?P<name>[A-Za-z_][A-Za-z_\d]*)',
+  r'(?P<space>\s+)',
+  '(?P<operator>[%s])' % re.escape(''.join(OPERATORS)),
+  '(?P<parenthesis>[%s])' % re.escape(Signature.LEFT_PARENTHESIS + Signature.RIGHT_PARENTHESIS),
+  '(?P<delimiter>%s)' % re.escape(Signature.DELIMITER),
+  r'(?P<unknown>.)',
+)), re.DOTALL)
+
+
+class ExpressionScanner:
+  def __init__(self, expression: str = str(), max_errors: int = 0):
+    self.__tokens: list[Token] = list()
+    self.__exceptions: list[ParsingExeprion] = list()
+    self.__positions: set[int] = set()
+    self.__max_errors: int = max_errors
+    self.scan(expression)
+
+
+  def scan(self, expression: str):
+    self.__reset()
+    self.__generate_tokens(expression)
+    self.__close()
+
+
+  def scan_stream(self, stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Token]:
+    return self.scan_chunks(iter(lambda: stream.read(chunk_size), str()))
+
+
+  def scan_chunks(self, chunks: Iterable[str]) -> Iterator[Token]:
+    self.__reset()
+    for chunk in chunks:
+      yield from self.feed(chunk)
+      if self.is_failed(): break
+    yield from self.finish()
+
+
+  def resume(self, offset: int, previous: str, last: (Token | None) = None, count: int = 0):
+    self.__reset()
+    self.__offset = offset
+    self.__previous = previous
+    self.__count = count
+    if last: self.__tokens.append(last)
+
+
+  def feed(self, chunk: str) -> list[Token]:
+    self.__generate_tokens(chunk)
+    return self.__pop_completed()
+
+
+  def finish(self) -> list[Token]:
+    self.__close()
+    return self.__pop_completed(last=True)
+
+
+  def is_failed(self) -> bool:
+    return 0 < self.__max_errors <= len(self.__exceptions)
+
+
+  def get_tokens(self) -> tuple[Token, ...]:
+    return tuple(self.__tokens)
+
+
+  def get_exceptions(self) -> tuple[ParsingExeprion, ...]:
+    return tuple(self.__exceptions)
+
+
+  def get_symbols(self) -> SymbolTable:
+    return SYMBOLS
+
+
+  def __reset(self):
+    self.__offset: int = 0
+    self.__count: int = 0
+    self.__previous: str = str()
+    self.__tokens.clear()
+    self.__exceptions.clear()
+    self.__positions.clear()
+
+
+  def __close(self):
+    for t in self.__tokens: t.value = t.value.strip()
+    self.__check_last_token()
+    self.__define_functions()
+
+
+  def __pop_completed(self, last: bool = False) -> list[Token]:
+    count = len(self.__tokens) if last else len(self.__tokens) - 1
+    if count <= 0: return list()
+    completed = self.__tokens[:count]
+    del self.__tokens[:count]
+    for t in completed:
+      t.value = t.value.strip()
+      if t.value in functions_args: t.type = TokenType.FUNCTION
+      intern_symbol(t)
+    return completed
+
+
+  def __generate_tokens(self, expression: str):
+    offset = self.__offset
+    for m in SCANNER_TEMPLATE.finditer(expression):
+      if self.is_failed(): break
+      run = m.group()
+      position = m.start() + offset
+      match m.lastgroup:
+        case 'number':
+          self.__add_run(run, TokenType.CONSTANT, position)
+        case 'name':
+          self.__add_run(run, TokenType.VARIABLE, position)
+        case 'space':
+          self.__handle_space(run)
+        case 'operator':
+          self.__add_operator_token(run, position)
+        case 'parenthesis':
+          self.__add_parenthesis(run, position)
+        case 'delimiter':
+          self.__add_delimiter(position)
+        case _:
+          self.__add_exeption('Unknown symbol "{symbol}"', run, position)
+      self.__previous = run[-1]
+    self.__offset += len(expression)
+
+
+  def __get_last_token(self) -> (Token | None):
+    return self.__tokens[-1] if self.__tokens else None
+
+
+  def __add_token(self, token: Token):
+    self.__tokens.append(token)
+    self.__count += 1
+
+
+  def __add_exeption(self, message: str, symbol: str, position: int):
+    if position in self.__positions or self.is_failed(): return
+    self.__positions.add(position)
+    ex = ParsingExeprion(message + ' at position {position}', symbol, position)
+    self.__exceptions.append(ex)
+
+
+  def __add_run(self, run: str, type: TokenType, position: int):
+    last = self.__get_last_token()
+    if last and last.type in (TokenType.CONSTANT, TokenType.VARIABLE):
+      self.__append_run(last, run, position)
+      return
+    if last and last.type == TokenType.PARENTHESIS and last.value == Signature.RIGHT_PARENTHESIS:
+      self.__add_exeption('Unexpected symbol "{symbol}"', run[0], position)
+      if self.is_failed(): run = run[0]
+    self.__add_token(Token(type, run, position, position + len(run) - 1))
+
+
+  def __append_run(self, token: Token, run: str, position: int):
+    previous = self.__previous
+    for ch in run:
+      if ch == Signature.FLOAT_POINT and token.type == TokenType.VARIABLE:
+        self.__add_exeption('Unexpected symbol "{symbol}"', ch, position)
+      elif ch == Signature.FLOAT_POINT and Signature.FLOAT_POINT in token.value:
+        self.__add_exeption('Invalid symbol "{symbol}"', ch, position)
+      else:
+        if token.type == TokenType.CONSTANT and SymbolTemplate.symbol.match(ch):
+          if SymbolTemplate.numbers_range.match(token.value):
+            self.__add_exeption('Invalid symbol "{symbol}"', ch, position)
+          token.type = TokenType.VARIABLE
+        if SymbolTemplate.space.match(previous):
+          self.__add_exeption('Unexpected symbol "{symbol}"', ch, position)
+      token.value += ch
+      token.end = position
+      if self.is_failed(): break
+      previous = ch
+      position += 1
+
+
+  def __add_operator_token(self, operator: str, position: int):
+    unary = operator in UNARY_OPERATORS
+    match self.__get_last_token():
+      case None if not unary:
+        self.__add_exeption('Invalid symbol operator "{symbol}"', operator, position)
+      case Token() as t if t.type == TokenType.CONSTANT and t.value.strip() == Signature.FLOAT_POINT:
+        self.__add_exeption('Invalid symbol "{symbol}"', operator, position)
+      case Token(type=TokenType.DELIMITER) if not unary:
+        self.__add_exeption('Invalid symbol "{symbol}"', operator, position)
+      case Token() as t if t.value == Signature.LEFT_PARENTHESIS and not unary:
+        self.__add_exeption('Invalid symbol operator "{symbol}"', operator, position)
+      case Token(type=TokenType.OPERATOR) if not unary:
+        self.__add_exeption('Invalid symbol operator "{symbol}"', operator, position)
+    self.__add_token(Token.of(operator, TokenType.OPERATOR, position))
+
+
+  def __add_parenthesis(self, parenthesis: str, position: int):
+    token = self.__get_last_token()
+    match parenthesis:
+      case Signature.LEFT_PARENTHESIS:
+        if token and (token.type == TokenType.CONSTANT or token.value == Signature.RIGHT_PARENTHESIS):
+          self.__add_exeption('Unexpected left parenthesis "{symbol}"', parenthesis, position)
+      case Signature.RIGHT_PARENTHESIS:
+        if not token:
+          self.__add_exeption('Unexpected right parenthesis', parenthesis, position)
+        elif token.type == TokenType.OPERATOR:
+          self.__add_exeption('Unexpected symbol "{symbol}"', parenthesis, position)
+        elif token.type == TokenType.CONSTANT and token.value.strip() == Signature.FLOAT_POINT:
+          self.__add_exeption('Invalid symbol "{symbol}"', parenthesis, position)
+        elif token.type == TokenType.DELIMITER:
+          self.__add_exeption('Unexpected symbol "{symbol}"', parenthesis, position)
+    self.__add_token(Token.of(parenthesis, TokenType.PARENTHESIS, position))
+
+
+  def __add_delimiter(self, position: int):
+    match self.__get_last_token():
+      case None:
+        self.__add_exeption('Unexpected delimiter symbol "{symbol}"', Signature.DELIMITER, position)
+      case Token() as t if t.type == TokenType.OPERATOR or t.value.strip() in (Signature.FLOAT_POINT, Signature.LEFT_PARENTHESIS):
+        self.__add_exeption('Unexpected delimiter symbol "{symbol}"', Signature.DELIMITER, position)
+      case Token(type=TokenType.DELIMITER):
+        self.__add_exeption('Unexpected delimiter symbol "{symbol}"', Signature.DELIMITER, position)
+    self.__add_token(Token.of(Signature.DELIMITER, TokenType.DELIMITER, position))
+
+
+  def __handle_space(self, space: str):
+    match self.__get_last_token():
+      case Token() as t if t.type in (TokenType.CONSTANT, TokenType.VARIABLE):
+        t.value += space
+
+
+  def __check_last_token(self):
+    match self.__get_last_token():
+      case Token() as t if t.type == TokenType.CONSTANT and t.value == Signature.FLOAT_POINT:
+        self.__add_exeption('Invalid symbol "{symbol}"', t.value, t.start)
+      case Token(type=TokenType.DELIMITER) as t:
+        if self.__count > 1:
+          self.__add_exeption('Invalid symbol "{symbol}"', t.value, t.start)
+      case Token(type=TokenType.PARENTHESIS, value=Signature.LEFT_PARENTHESIS) as t:
+        self.__add_exeption('Unexpected left parenthesis "{symbol}"', t.value, t.start)
+      case Token() as t if t.type == TokenType.OPERATOR:
+        unary = t.value in UNARY_OPERATORS
+        if unary or self.__count > 1 and not unary:
+          self.__add_exeption('Unexpected symbol "{symbol}"', t.value, t.start)
+
+
+  def __define_functions(self):
+    for t in self.__tokens:
+      if t.value in functions_args: t.type = TokenType.FUNCTION
+      intern_symbol(t)
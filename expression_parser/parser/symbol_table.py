@@ -0,0 +1,60 @@
+import sys
+from .tokens import Token, Signature
+
+
+def parse_number(value: str) -> (int | float | None):
+  try:
+    return float(value) if Signature.FLOAT_POINT in value else int(value)
+  except ValueError:
+    return None
+
+
+class SymbolTable:
+  def __init__(self):
+    self.__ids: dict[str, int] = dict()
+    self.__symbols: list[str] = list()
+    self.__numbers: list[int | float | None] = list()
+
+
+  def add(self, value: str) -> int:
+    symbol_id = self.__ids.get(value)
+    if symbol_id is None:
+      symbol_id = len(self.__symbols)
+      symbol = sys.intern(value)
+      self.__ids[symbol] = symbol_id
+      self.__symbols.append(symbol)
+      self.__numbers.append(parse_number(symbol))
+    return symbol_id
+
+
+  def get_id(self, value: str) -> int:
+    return self.__ids.get(value, -1)
+
+
+  def get_symbol(self, symbol_id: int) -> str:
+    return self.__symbols[symbol_id]
+
+
+  def get_number(self, symbol_id: int) -> (int | float | None):
+    return self.__numbers[symbol_id]
+
+
+  def __len__(self) -> int:
+    return len(self.__symbols)
+
+
+  def __contains__(self, value: str) -> bool:
+    return value in self.__ids
+
+
+SYMBOLS: SymbolTable = SymbolTable()
+
+
+def intern_symbol(token: Token) -> int:
+  symbol_id = SYMBOLS.add(token.value)
+  token.value = SYMBOLS.get_symbol(symbol_id)
+  return symbol_id
+
+
+def get_number(value: str) -> (int | float | None):
+  return SYMBOLS.get_number(SYMBOLS.add(value))
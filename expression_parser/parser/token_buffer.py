@@ -0,0 +1,150 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Sequence
+from .tokens import Token, TokenType
+from .exceptions import ParsingExeprion
+from .expression_scanner import ExpressionScanner, CHUNK_SIZE
+
+
+TOKEN_TYPES: tuple[TokenType, ...] = tuple(TokenType)
+TYPE_CODES: dict[TokenType, int] = {t: i for i, t in enumerate(TOKEN_TYPES)}
+
+
+class TokenBuffer(Sequence[Token]):
+  def __init__(self, source: str):
+    self.__source: str = source
+    self.__types: bytearray = bytearray()
+    self.__starts: array = array('l')
+    self.__ends: array = array('l')
+    self.__values: dict[int, str] = dict()
+    self.__exceptions: tuple[ParsingExeprion, ...] = tuple()
+
+
+  @staticmethod
+  def of(source: str, tokens: Iterable[Token], exceptions: Iterable[ParsingExeprion] = tuple()):
+    buffer = TokenBuffer(source)
+    for t in tokens: buffer.append(t)
+    buffer.set_exceptions(exceptions)
+    return buffer
+
+
+  @staticmethod
+  def scan(source: str, chunk_size: int = CHUNK_SIZE):
+    scanner = ExpressionScanner()
+    chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    buffer = TokenBuffer.of(source, scanner.scan_chunks(chunks))
+    buffer.set_exceptions(scanner.get_exceptions())
+    return buffer
+
+
+  def append(self, token: Token):
+    index = len(self.__types)
+    self.__types.append(TYPE_CODES[token.type])
+    self.__starts.append(token.start)
+    self.__ends.append(token.end)
+    if self.__source[token.start:token.end + 1] != token.value:
+      self.__values[index] = token.value
+
+
+  def set_exceptions(self, exceptions: Iterable[ParsingExeprion]):
+    self.__exceptions = tuple(exceptions)
+
+
+  def edit(self, offset: int, deleted: int, inserted: str):
+    source = self.__source
+    edit_end = offset + deleted
+    delta = len(inserted) - deleted
+    updated = source[:offset] + inserted + source[edit_end:]
+    shift = lambda p: p if p < offset else (p + delta if p >= edit_end else -1)
+
+    ended = bisect_left(self.__ends, offset)
+    restart = max(ended - 1, 0)
+    start = self.__starts[restart] if ended else 0
+    last = self[restart - 1] if restart else None
+    if last and last.type == TokenType.FUNCTION: last.type = TokenType.VARIABLE
+    scanner = ExpressionScanner()
+    scanner.resume(start, updated[start - 1] if start else str(), last, restart)
+
+    scanned: list[Token] = list()
+    take = lambda tokens: scanned.extend(t for t in tokens if t is not last)
+    position = offset + len(inserted)
+    take(scanner.feed(updated[start:position]))
+    synchronized = len(self)
+    for i in range(bisect_left(self.__starts, edit_end), len(self)):
+      target = self.__starts[i] + delta
+      take(scanner.feed(updated[position:target + 1]))
+      position = target + 1
+      pending = scanner.get_tokens()
+      if not (scanned and pending and pending[-1].start == target): continue
+      previous = self[i - 1]
+      previous.start = shift(previous.start)
+      previous.end = shift(previous.end)
+      if scanned[-1] == previous:
+        synchronized = i
+        break
+    else:
+      take(scanner.feed(updated[position:]))
+      take(scanner.finish())
+
+    buffer = TokenBuffer(updated)
+    buffer.__types = self.__types[:restart]
+    buffer.__starts = self.__starts[:restart]
+    buffer.__ends = self.__ends[:restart]
+    buffer.__values = {i: v for i, v in self.__values.items() if i < restart}
+    for t in scanned: buffer.append(t)
+    index_shift = len(buffer) - synchronized
+    buffer.__types.extend(self.__types[synchronized:])
+    buffer.__starts.extend(p + delta for p in self.__starts[synchronized:])
+    buffer.__ends.extend(p + delta for p in self.__ends[synchronized:])
+    buffer.__values.update((i + index_shift, v) for i, v in self.__values.items() if i >= synchronized)
+
+    resync_position = self.__starts[synchronized] if synchronized < len(self) else len(source) + 1
+    exceptions = [e for e in self.__exceptions if e.position < start]
+    exceptions.extend(e for e in scanner.get_exceptions() if e.position < resync_position + delta)
+    exceptions.extend(
+      ParsingExeprion(e.template, e.symbol, e.position + delta) if delta else e
+      for e in self.__exceptions if e.position >= resync_position
+    )
+    buffer.set_exceptions(exceptions)
+    return buffer
+
+
+  def get_source(self) -> str:
+    return self.__source
+
+
+  def get_exceptions(self) -> tuple[ParsingExeprion, ...]:
+    return self.__exceptions
+
+
+  def get_type(self, index: int) -> TokenType:
+    return TOKEN_TYPES[self.__types[index]]
+
+
+  def get_value(self, index: int) -> str:
+    value = self.__values.get(index)
+    if value is not None: return value
+    return self.__source[self.__starts[index]:self.__ends[index] + 1]
+
+
+  def get_start(self, index: int) -> int:
+    return self.__starts[index]
+
+
+  def get_end(self, index: int) -> int:
+    return self.__ends[index]
+
+
+  def __len__(self) -> int:
+    return len(self.__types)
+
+
+  def __getitem__(self, index: int) -> Token:
+    if index < 0: index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError('TokenBuffer index out of range')
+    return Token(self.get_type(index), self.get_value(index), self.__starts[index], self.__ends[index])
+
+
+  def __iter__(self) -> Iterator[Token]:
+    for i in range(len(self)): yield self[i]
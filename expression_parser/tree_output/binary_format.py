@@ -0,0 +1,220 @@
+import mmap
+import struct
+from enum import IntEnum
+from typing import Iterable, Iterator, Sequence
+from types import NoneType
+from expression_parser.parser.tokens import Token
+from expression_parser.parser.token_buffer import TOKEN_TYPES, TYPE_CODES
+from expression_parser.analyzer.tree_nodes import Node, UnaryOperatorNode, BinaryOperatorNode, FunctionNode, get_children
+from expression_parser.analyzer.flat_tree import Opcode
+
+
+MAGIC = b'EXPR'
+VERSION = 1
+NO_TOKEN = 0xFF
+NO_NODE = 0xFF
+
+HEADER = struct.Struct('<4sBBII')
+OFFSET = struct.Struct('<I')
+TOKEN_RECORD = struct.Struct('<BIii')
+NODE_RECORD = struct.Struct('<BBHIiiI')
+
+
+class Content(IntEnum):
+  TOKENS = 0
+  TREE = 1
+
+
+class StringTable:
+  def __init__(self):
+    self.__indexes: dict[str, int] = dict()
+
+
+  def add(self, value: str) -> int:
+    return self.__indexes.setdefault(value, len(self.__indexes))
+
+
+  def to_bytes(self) -> bytes:
+    encoded = tuple(s.encode() for s in self.__indexes)
+    offsets = [0]
+    for s in encoded: offsets.append(offsets[-1] + len(s))
+    return b''.join(OFFSET.pack(o) for o in offsets) + b''.join(encoded)
+
+
+  def __len__(self) -> int:
+    return len(self.__indexes)
+
+
+def dump_tokens(tokens: Iterable[Token]) -> bytes:
+  strings = StringTable()
+  records = [TOKEN_RECORD.pack(TYPE_CODES[t.type], strings.add(t.value), t.start, t.end) for t in tokens]
+  return HEADER.pack(MAGIC, VERSION, Content.TOKENS, len(records), len(strings)) + strings.to_bytes() + b''.join(records)
+
+
+def dump_tree(tree: Node) -> bytes:
+  nodes: list[(Node | NoneType)] = list()
+  stack: list[(Node | NoneType)] = [tree]
+  while stack:
+    node = stack.pop()
+    nodes.append(node)
+    stack.extend(reversed(get_children(node)))
+  sizes = [1] * len(nodes)
+  for i in reversed(range(len(nodes))):
+    child = i + 1
+    for _ in get_children(nodes[i]):
+      sizes[i] += sizes[child]
+      child += sizes[child]
+  strings = StringTable()
+  records = list()
+  for node, size in zip(nodes, sizes):
+    if node is None:
+      records.append(NODE_RECORD.pack(NO_NODE, NO_TOKEN, 0, 0, 0, 0, size))
+      continue
+    token = node.value
+    opcode = __get_opcode(node)
+    arity = len(get_children(node))
+    if token is None:
+      records.append(NODE_RECORD.pack(opcode, NO_TOKEN, arity, 0, 0, 0, size))
+    else:
+      records.append(NODE_RECORD.pack(opcode, TYPE_CODES[token.type], arity, strings.add(token.value), token.start, token.end, size))
+  return HEADER.pack(MAGIC, VERSION, Content.TREE, len(records), len(strings)) + strings.to_bytes() + b''.join(records)
+
+
+def write_tokens(path: str, tokens: Iterable[Token]):
+  with open(path, 'wb') as f:
+    f.write(dump_tokens(tokens))
+
+
+def write_tree(path: str, tree: Node):
+  with open(path, 'wb') as f:
+    f.write(dump_tree(tree))
+
+
+def map_file(path: str) -> mmap.mmap:
+  with open(path, 'rb') as f:
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_tokens(path: str) -> tuple[Token, ...]:
+  with map_file(path) as buffer:
+    return tuple(TokenReader(buffer))
+
+
+def load_tree(path: str) -> Node:
+  with map_file(path) as buffer:
+    return TreeReader(buffer).get_tree()
+
+
+class BinaryReader:
+  def __init__(self, buffer: (bytes | memoryview | mmap.mmap), content: Content):
+    magic, version, stored, count, strings_count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC or version != VERSION:
+      raise ValueError('Unsupported binary format')
+    if stored != content:
+      raise ValueError(f'Expected {content.name.lower()} content, found {Content(stored).name.lower()}')
+    self.__buffer = buffer
+    self.__count: int = count
+    self.__offsets_start: int = HEADER.size
+    self.__strings_start: int = HEADER.size + OFFSET.size * (strings_count + 1)
+    strings_size = OFFSET.unpack_from(buffer, self.__strings_start - OFFSET.size)[0]
+    self.__records_start: int = self.__strings_start + strings_size
+    self.__strings: dict[int, str] = dict()
+
+
+  def get_string(self, index: int) -> str:
+    value = self.__strings.get(index)
+    if value is not None: return value
+    start, end = struct.unpack_from('<II', self.__buffer, self.__offsets_start + OFFSET.size * index)
+    value = str(self.__buffer[self.__strings_start + start:self.__strings_start + end], 'utf-8')
+    self.__strings[index] = value
+    return value
+
+
+  def get_record(self, record: struct.Struct, index: int) -> tuple:
+    if index < 0: index += len(self)
+    if not 0 <= index < len(self):
+      raise IndexError(f'{type(self).__name__} index out of range')
+    return record.unpack_from(self.__buffer, self.__records_start + record.size * index)
+
+
+  def __len__(self) -> int:
+    return self.__count
+
+
+class TokenReader(BinaryReader, Sequence[Token]):
+  def __init__(self, buffer: (bytes | memoryview | mmap.mmap)):
+    super().__init__(buffer, Content.TOKENS)
+
+
+  def __getitem__(self, index: int) -> Token:
+    type_code, value, start, end = self.get_record(TOKEN_RECORD, index)
+    return Token(TOKEN_TYPES[type_code], self.get_string(value), start, end)
+
+
+  def __iter__(self) -> Iterator[Token]:
+    for i in range(len(self)): yield self[i]
+
+
+class TreeReader(BinaryReader):
+  def __init__(self, buffer: (bytes | memoryview | mmap.mmap)):
+    super().__init__(buffer, Content.TREE)
+
+
+  def get_opcode(self, index: int) -> (Opcode | NoneType):
+    opcode = self.get_record(NODE_RECORD, index)[0]
+    return None if opcode == NO_NODE else Opcode(opcode)
+
+
+  def get_token(self, index: int) -> (Token | NoneType):
+    return self.__get_token(self.get_record(NODE_RECORD, index))
+
+
+  def get_size(self, index: int) -> int:
+    return self.get_record(NODE_RECORD, index)[6]
+
+
+  def get_children(self, index: int) -> list[int]:
+    children: list[int] = list()
+    child = index + 1
+    for _ in range(self.get_record(NODE_RECORD, index)[2]):
+      children.append(child)
+      child += self.get_size(child)
+    return children
+
+
+  def get_tree(self, index: int = 0) -> (Node | NoneType):
+    built: list[(Node | NoneType)] = list()
+    for i in reversed(range(index, index + self.get_size(index))):
+      record = self.get_record(NODE_RECORD, i)
+      opcode, arity, token = record[0], record[2], self.__get_token(record)
+      if opcode == NO_NODE:
+        built.append(None)
+        continue
+      match opcode:
+        case Opcode.UNARY:
+          built.append(UnaryOperatorNode(value=token, expression=built.pop()))
+        case Opcode.BINARY:
+          left = built.pop()
+          built.append(BinaryOperatorNode(value=token, left=left, right=built.pop()))
+        case Opcode.FUNCTION:
+          built.append(FunctionNode(value=token, args=tuple(built.pop() for _ in range(arity))))
+        case _:
+          built.append(Node(value=token))
+    return built.pop()
+
+
+  def __get_token(self, record: tuple[int, ...]) -> (Token | NoneType):
+    _, type_code, _, value, start, end, _ = record
+    if type_code == NO_TOKEN: return None
+    return Token(TOKEN_TYPES[type_code], self.get_string(value), start, end)
+
+
+def __get_opcode(node: Node) -> Opcode:
+  match node:
+    case UnaryOperatorNode():
+      return Opcode.UNARY
+    case BinaryOperatorNode():
+      return Opcode.BINARY
+    case FunctionNode():
+      return Opcode.FUNCTION
+  return Opcode.LEAF
@@ -27,6 +27,11 @@ def log_syntax_exception(exception: SyntaxAnalysisException):
   print('\nSyntax error:\n', exception)
 
 
+def log_syntax_exceptions(message: str, exceptions: Sequence[SyntaxAnalysisException]):
+  print(f'\n{message}:')
+  for e in exceptions: print(e)
+
+
 def log_syntax_tree(tree: Node):
   print('\nSyntax tree:\n', tree.to_json())
 
@@ -51,6 +51,10 @@ class ExpressionView:
   def show_syntax_exception(self, exception: SyntaxAnalysisException): ...
 
 
+  @__method_wrapper(console_output.log_syntax_exceptions)
+  def show_syntax_exceptions(self, message: str, exceptions: Sequence[SyntaxAnalysisException]): ...
+
+
   @__method_wrapper(console_output.log_default_conveyor_data)
   def log_dafault_conveyor_data(self, data: SimulationData): ...
 
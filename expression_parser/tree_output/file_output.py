@@ -1,9 +1,9 @@
 import os
-import json
 from typing import Sequence
 from expression_parser.parser.tokens import Token
 from expression_parser.analyzer.tree_nodes import Node
 from .graph_builder import build_tree_graph
+from .json_writer import write_json
 
 
 OUTPUT_DIR = 'dist'
@@ -25,20 +25,19 @@ def dist_check(fn):
 @dist_check
 def write_syntax_tree(tree: Node):
   with open(SYNTAX_TREE_PATH + '.json', 'w') as f:
-    f.write(tree.to_json())
+    write_json(tree, f)
 
 
 @dist_check
 def write_parallel_tree(tree: Node):
   with open(PARALLEL_TREE_PATH + '.json', 'w') as f:
-    f.write(tree.to_json())
+    write_json(tree, f)
 
 
 @dist_check
 def write_tokens(tokens: Sequence[Token]):
-  json_list = json.dumps(tuple(tokens), default=lambda o: o.__dict__, indent=2)
   with open(TOKEN_LIST_PATH + '.json', 'w') as f:
-    f.write(json_list)
+    write_json(tuple(tokens), f)
 
 
 @dist_check
@@ -0,0 +1,68 @@
+import json
+from typing import Iterator, TextIO
+
+
+CHUNK_SIZE = 1 << 16
+
+JsonFrame = list[Iterator, bool, int, bool]
+
+
+def iter_json(value, indent: (int | None) = 2) -> Iterator[str]:
+  key_separator = ': ' if indent is not None else ':'
+  stack: list[JsonFrame] = list()
+  yield from __open_value(value, stack, 0)
+  while stack:
+    frame = stack[-1]
+    items, is_object, depth, first = frame
+    item = next(items, None)
+    if item is None:
+      stack.pop()
+      yield __get_padding(indent, depth - 1) + ('}' if is_object else ']')
+      continue
+    frame[3] = False
+    prefix = ('' if first else ',') + __get_padding(indent, depth)
+    if is_object:
+      key, item = item
+      prefix += json.dumps(key) + key_separator
+    else:
+      item = item[0]
+    yield prefix
+    yield from __open_value(item, stack, depth)
+
+
+def write_json(value, stream: TextIO, indent: (int | None) = 2, chunk_size: int = CHUNK_SIZE):
+  buffered: list[str] = list()
+  size = 0
+  for chunk in iter_json(value, indent):
+    buffered.append(chunk)
+    size += len(chunk)
+    if size >= chunk_size:
+      stream.write(''.join(buffered))
+      buffered.clear()
+      size = 0
+  stream.write(''.join(buffered))
+
+
+def __open_value(value, stack: list[JsonFrame], depth: int) -> Iterator[str]:
+  match value:
+    case None | bool() | int() | float() | str():
+      yield json.dumps(value)
+    case list() | tuple():
+      if not value:
+        yield '[]'
+        return
+      yield '['
+      stack.append([((v,) for v in value), False, depth + 1, True])
+    case dict():
+      if not value:
+        yield '{}'
+        return
+      yield '{'
+      stack.append([iter(value.items()), True, depth + 1, True])
+    case _:
+      yield from __open_value(dict(type=value.__class__.__name__) | value.__dict__, stack, depth)
+
+
+def __get_padding(indent: (int | None), depth: int) -> str:
+  if indent is None: return ''
+  return '\n' + ' ' * (indent * depth)
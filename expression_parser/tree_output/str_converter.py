@@ -1,6 +1,7 @@
 from typing import Callable
 from expression_parser.parser.tokens import Token, Operator
 from expression_parser.analyzer.tree_nodes import Node, UnaryOperatorNode, FunctionNode, BinaryOperatorNode
+from expression_parser.analyzer.flat_tree import FlatTree, Opcode
 
 
 def stringify_tree(node: Node) -> str:
@@ -35,6 +36,34 @@ def stringify_tree(node: Node) -> str:
       return str_value
 
 
+def stringify_flat_tree(tree: FlatTree) -> str:
+  stringified: list[tuple[str, Opcode, str]] = list()
+  for i in range(len(tree)):
+    opcode, token = tree.get_opcode(i), tree.get_token(i)
+    str_value = token.value if token else str()
+    match opcode:
+      case Opcode.BINARY:
+        right = stringified.pop()
+        left = stringified.pop()
+        wrap_left, wrap_right = __flat_wrapping_rules(str_value, left, right)
+        left_str = f'({left[0]})' if wrap_left else left[0]
+        right_str = f'({right[0]})' if wrap_right else right[0]
+        value = ' '.join((left_str, str_value, right_str)) if wrap_left is not None else str_value
+      case Opcode.FUNCTION:
+        count = tree.get_children_count(i)
+        args = ', '.join(s for s, _, _ in stringified[len(stringified) - count:]) if count else str()
+        if count: del stringified[-count:]
+        value = f'{str_value}({args})'
+      case Opcode.UNARY:
+        expression, _, expression_value = stringified.pop()
+        if Operator.isop(expression_value): expression = f'({expression})'
+        value = str_value + expression
+      case _:
+        value = str_value
+    stringified.append((value, opcode, str_value))
+  return stringified.pop()[0] if stringified else str()
+
+
 def wrap_in_brackets(operator: BinaryOperatorNode, rules: tuple[Callable[[Node], bool], Callable[[Node], bool]]) -> str:
   nodes = (operator.left, operator.right)
   stringified = tuple(stringify_tree(n) for n in nodes)
@@ -45,3 +74,19 @@ def wrap_in_brackets(operator: BinaryOperatorNode, rules: tuple[Callable[[Node],
 
 def __operator_check(check: Callable[[str], bool]) -> Callable[[Node], bool]:
   return lambda n: isinstance(n, BinaryOperatorNode) and check(n.value.value)
+
+
+def __flat_wrapping_rules(operator: str, left: tuple[str, Opcode, str], right: tuple[str, Opcode, str]) -> tuple[bool | None, bool]:
+  check = lambda n, c: n[1] == Opcode.BINARY and c(n[2])
+  match operator:
+    case Operator.PLUS.value:
+      return False, False
+    case Operator.MINUS.value:
+      return False, check(right, Operator.isunary)
+    case Operator.MULTIPLY.value:
+      return check(left, Operator.isunary), check(right, Operator.isunary)
+    case Operator.DIVIDE.value:
+      return check(left, Operator.isunary), check(right, lambda n: Operator.isop(n) and n != Operator.POWER.value)
+    case Operator.POWER.value:
+      return check(left, lambda _: True), check(right, lambda _: True)
+  return None, None
@@ -13,8 +13,7 @@ class ConsoleInputClient:
 
 
   def __parse_expression(self, expression: str):
-    tokens = self.__builder.build_token_list(expression)
-    tree = self.__builder.build_syntax_tree(tokens)
+    tree = self.__builder.parse_syntax_tree(expression, recover=True)
     distributive_forms, commutative_forms = self.__builder.build_equivalent_forms(tree)
     self.__builder.build_conveyor_simulations(tree, distributive_forms, commutative_forms)
 
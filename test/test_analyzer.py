@@ -1,8 +1,17 @@
 import unittest
+import io
 from expression_parser.parser.tokens import Token, TokenType, Signature, Operator
 from expression_parser.parser.expression_parser import ExpressionParser
 from expression_parser.analyzer.syntax_analyzer import SyntaxAnalyzer, SyntaxAnalysisException
-from expression_parser.analyzer.tree_nodes import Node, BinaryOperatorNode, UnaryOperatorNode, FunctionNode
+from expression_parser.analyzer.iterative_analyzer import IterativeSyntaxAnalyzer
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.analyzer.dag_builder import build_dag
+from expression_parser.analyzer.fingerprint import StructuralKey, FingerprintCache, structurally_equal, get_unique_forms
+from expression_parser.analyzer.flat_tree import FlatTree, Opcode
+from expression_parser.tree_output.str_converter import stringify_tree, stringify_flat_tree
+from expression_parser.conveyor_simulation.utils import flat_operations
+from expression_parser.analyzer.frozen_nodes import freeze, thaw, FrozenBinaryOperatorNode
+from expression_parser.analyzer.tree_nodes import Node, BinaryOperatorNode, UnaryOperatorNode, FunctionNode, iter_postorder, fold_tree
 
 
 class TestExpressionParser(unittest.TestCase):
@@ -221,3 +230,183 @@ class TestExpressionParser(unittest.TestCase):
     self.assertEqual(expected1.format(token1), str(context_fn.exception))
     self.assertEqual(expected2.format(token2), str(context_rp.exception))
     self.assertEqual(expected3.format(token3), str(context_lp.exception))
+
+
+  def test_iterative_analyzer_output(self):
+    expressions = (
+      str(), '-(p + 3) + (-4 ^ 2)', 'a +  b * c / d - e', '+-+-x ^ -y',
+      'max(sin(a), pow(b, 2)) * rand()', '(((a)))',
+      '4 + sin', 'fn(3)', 'sin()', 'max(kg, 3, aj_io9)', 'rand(23)',
+      '2 + ((7+s) + 4', '2 +(7)) + 4', 'sin( 9', 'w + r) - 8', '*', 'max(1,)',
+    )
+    for expression in expressions:
+      with self.subTest(expression=expression):
+        tokens = ExpressionParser(expression).get_tokens()
+        try:
+          expected = SyntaxAnalyzer(tokens).get_tree()
+        except SyntaxAnalysisException as e:
+          with self.assertRaises(SyntaxAnalysisException) as context:
+            IterativeSyntaxAnalyzer(tokens)
+          self.assertEqual(str(e), str(context.exception))
+          self.assertIs(e.token, context.exception.token)
+          continue
+        self.assertEqual(expected, IterativeSyntaxAnalyzer(iter(tokens)).get_tree())
+
+
+  def test_iterative_analyzer_deep_nesting(self):
+    depth = 5000
+    expression = '(' * depth + '-' * depth + 'a' + ')' * depth
+    node = IterativeSyntaxAnalyzer(ExpressionParser(expression).get_tokens()).get_tree()
+    for _ in range(depth):
+      self.assertIsInstance(node, UnaryOperatorNode)
+      node = node.expression
+    self.assertEqual(Node(value=Token.of('a', TokenType.VARIABLE, depth * 2)), node)
+
+
+  def test_fused_parse(self):
+    expression = 'max(sin(a), -b ^ 2) / (c + 4.5)'
+    tokens = list()
+    self.assertEqual(self.__build_tree(expression), parse(expression, tokens.append, chunk_size=4))
+    self.assertTupleEqual(ExpressionParser(expression).get_tokens(), tuple(tokens))
+    self.assertEqual(self.__build_tree(expression), parse(io.StringIO(expression)))
+    self.assertEqual(Node(value=None), parse(str()))
+
+
+  def test_fused_parse_exceptions(self):
+    with self.assertRaises(ExceptionGroup) as context_parsing:
+      parse('w + r) - $ 8')
+    with self.assertRaises(SyntaxAnalysisException) as context_syntax:
+      parse('w + r) - 8')
+
+    self.assertTupleEqual(
+      ('Unknown symbol "$" at position 9',),
+      tuple(str(e) for e in context_parsing.exception.exceptions),
+    )
+    expected_token = Token.of(Signature.RIGHT_PARENTHESIS, TokenType.PARENTHESIS, 5)
+    self.assertEqual('Unexpected token: "{}"'.format(expected_token), str(context_syntax.exception))
+
+
+
+  def test_syntax_errors_recovery(self):
+    expression = 'fn(3) + sin() * max(1) + 2 +(7)) + a'
+    fn = Token(value='fn', type=TokenType.VARIABLE, start=0, end=1)
+    sin = Token(value='sin', type=TokenType.FUNCTION, start=8, end=10)
+    max = Token(value='max', type=TokenType.FUNCTION, start=16, end=18)
+    rp = Token.of(Signature.RIGHT_PARENTHESIS, TokenType.PARENTHESIS, 31)
+    expected = (
+      'No such function, cannot call: "{}"'.format(fn),
+      'Too few arguments (given: 0) for called funtion (expected: 1): "{}"'.format(sin),
+      'Too few arguments (given: 1) for called funtion (expected: 2): "{}"'.format(max),
+      'Unexpected token: "{}"'.format(rp),
+    )
+
+    with self.assertRaises(ExceptionGroup) as context_recover:
+      SyntaxAnalyzer(ExpressionParser(expression).get_tokens(), recover=True)
+    with self.assertRaises(ExceptionGroup) as context_fused:
+      parse(expression, recover=True)
+    with self.assertRaises(SyntaxAnalysisException) as context_first:
+      self.__build_tree(expression)
+
+    self.assertTupleEqual(expected, tuple(str(e) for e in context_recover.exception.exceptions))
+    self.assertTupleEqual(expected, tuple(str(e) for e in context_fused.exception.exceptions))
+    self.assertEqual(expected[0], str(context_first.exception))
+    tokens = ExpressionParser('max(a, 2) - b').get_tokens()
+    self.assertEqual(SyntaxAnalyzer(tokens).get_tree(), SyntaxAnalyzer(tokens, recover=True).get_tree())
+    with self.assertRaises(ExceptionGroup) as context_deep:
+      parse('(' * 3000 + 'a', recover=True)
+    self.assertEqual(3000, len(context_deep.exception.exceptions))
+    self.assertEqual('a', parse('(' * 3000 + 'a' + ')' * 3000, recover=True).value.value)
+
+
+  def test_frozen_nodes(self):
+    tree = self.__build_tree('max(sin(a), -b ^ 2) / (c + 4.5)')
+    frozen = freeze(tree)
+    same = freeze(self.__build_tree('max(sin(a), -b ^ 2) / (c + 4.5)'))
+    deep = freeze(parse('-' * 5000 + 'a'))
+    other = freeze(self.__build_tree('max(sin(a), -b ^ 2) / (c + 4.6)'))
+
+    self.assertEqual(tree, thaw(frozen))
+    self.assertIsNot(tree.value, thaw(frozen).value)
+    self.assertIsInstance(frozen, FrozenBinaryOperatorNode)
+    self.assertEqual(frozen, same)
+    self.assertEqual(hash(frozen), hash(same))
+    self.assertEqual(freeze(parse('a*b')), freeze(parse('a * b')))
+    self.assertEqual(hash(freeze(parse('a*b'))), hash(freeze(parse('a * b'))))
+    self.assertEqual(4, thaw(freeze(parse('a * b'))).right.value.start)
+    self.assertEqual(deep, freeze(thaw(deep)))
+    self.assertNotEqual(frozen, other)
+    self.assertEqual(2, len({frozen, same, other}))
+    self.assertEqual(frozen.right, dict.fromkeys([frozen.right]).popitem()[0])
+    with self.assertRaises(AttributeError):
+      frozen.left = frozen.right
+
+
+  def test_tree_walkers(self):
+    tree = parse('max(a, -b) * c')
+    incomplete = BinaryOperatorNode(value=tree.value, left=tree.left, right=None)
+    dag = build_dag(parse('(a + b) * (a + b)'))
+    size = lambda node, sizes: 1 + sum(s for s in sizes if s)
+
+    self.assertListEqual(['a', 'b', '-', 'max', 'c', '*'], [n.value.value for n in iter_postorder(tree)])
+    self.assertListEqual(['a', 'b', '+', '*'], [n.value.value for n in iter_postorder(dag)])
+    self.assertEqual(5, fold_tree(incomplete, size))
+    self.assertEqual(10001, fold_tree(parse('-' * 10000 + 'a'), size))
+    self.assertIsNone(fold_tree(None, size))
+
+
+  def test_dag_shared_subexpressions(self):
+    dag = build_dag(self.__build_tree('sin(a*b) + cos(a * b) * (a*b) + rand() * rand()'))
+    operations = list()
+    flat_operations(dag, operations)
+    sin_call, cos_call = dag.left.left, dag.left.right.left
+    rand_calls = dag.right.left, dag.right.right
+
+    self.assertIs(sin_call.args[0], cos_call.args[0])
+    self.assertIs(sin_call.args[0], dag.left.right.right)
+    self.assertIsNot(*rand_calls)
+    random_sums = build_dag(parse('(rand() + 1) * (rand() + 1)'))
+    self.assertIsNot(random_sums.left, random_sums.right)
+    self.assertEqual(9, len(operations))
+    self.assertEqual(len(operations), len(set(map(id, operations))))
+
+
+  def test_flat_tree(self):
+    tree = self.__build_tree('max(sin(a), -(b - c) ^ 2) / (c + 4.5) - d')
+    flat = FlatTree.of(tree)
+    operations = list()
+    flat_operations(tree, operations)
+
+    self.assertEqual(tree, flat.to_tree())
+    self.assertEqual(stringify_tree(tree), stringify_flat_tree(flat))
+    self.assertListEqual([n.value for n in operations], [flat.get_token(i) for i in flat.get_operations()])
+    self.assertEqual(15, len(flat))
+    self.assertEqual(7, flat.get_depth())
+    self.assertEqual(Opcode.BINARY, flat.get_opcode(len(flat) - 1))
+    self.assertListEqual([12, 13], flat.get_children(len(flat) - 1))
+    self.assertEqual(Node(value=None), FlatTree.of(self.__build_tree(str())).to_tree())
+
+
+  def test_structural_fingerprint(self):
+    tree = self.__build_tree('max(sin(a), -b ^ 2) / (c + 4.5)')
+    moved = self.__build_tree('max( sin(a),  -b^2 )/(c+4.5)')
+    regrouped = self.__build_tree('(a + b) + c')
+    cache = FingerprintCache()
+    keys = [StructuralKey(n, cache) for n in (tree, moved, regrouped, self.__build_tree('a + (b + c)'))]
+
+    self.assertNotEqual(tree, moved)
+    self.assertTrue(structurally_equal(tree, moved))
+    self.assertTrue(structurally_equal(build_dag(tree), moved))
+    self.assertFalse(structurally_equal(tree, self.__build_tree('max(sin(a), -b ^ 2) / (c + 4)')))
+    self.assertEqual(keys[0], keys[1])
+    self.assertNotEqual(keys[2], keys[3])
+    self.assertEqual(3, len(set(keys)))
+    self.assertEqual(keys[0], StructuralKey(moved))
+
+
+  def test_unique_forms(self):
+    forms = [parse(e) for e in ('(a + b) + c', 'a + (b + c)', '(a+b)+c', 'a + b + c', 'c + (a + b)')]
+    unique = get_unique_forms(forms, parse('c + (a+b)'))
+
+    self.assertListEqual(['a + b + c', 'a + b + c'], [stringify_tree(n) for n in unique])
+    self.assertIs(forms[3], unique[0])
+    self.assertIsInstance(unique[1].right, BinaryOperatorNode)
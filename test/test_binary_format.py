@@ -0,0 +1,57 @@
+import unittest
+import os
+import tempfile
+from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.analyzer.syntax_analyzer import SyntaxAnalyzer
+from expression_parser.analyzer.tree_nodes import Node, BinaryOperatorNode
+from expression_parser.analyzer.flat_tree import Opcode
+from expression_parser.parallel_tree.builder import build_parallel_tree
+from expression_parser.tree_output.binary_format import (
+  TokenReader, TreeReader, dump_tokens, dump_tree, write_tokens, write_tree, load_tokens, load_tree, map_file,
+)
+
+
+class TestExpressionParser(unittest.TestCase):
+  EXPRESSION = 'max(sin(a), -b ^ 2) / (c + 4.5) - rand() * a'
+
+
+  def test_tokens_round_trip(self):
+    tokens = ExpressionParser(self.EXPRESSION).get_tokens()
+    reader = TokenReader(dump_tokens(tokens))
+
+    self.assertEqual(len(tokens), len(reader))
+    self.assertEqual(tokens[-1], reader[-1])
+    self.assertTupleEqual(tokens, tuple(reader))
+    self.assertTupleEqual(tuple(), tuple(TokenReader(dump_tokens(tuple()))))
+
+
+  def test_tree_round_trip(self):
+    tree = build_parallel_tree(SyntaxAnalyzer(ExpressionParser(self.EXPRESSION).get_tokens()).get_tree())
+    reader = TreeReader(dump_tree(tree))
+    left, right = reader.get_children(0)
+    incomplete = BinaryOperatorNode(value=tree.value, left=tree.left, right=None)
+
+    self.assertEqual(tree, reader.get_tree())
+    self.assertEqual(tree.right, reader.get_tree(right))
+    self.assertEqual(Opcode.BINARY, reader.get_opcode(0))
+    self.assertEqual(tree.value, reader.get_token(0))
+    self.assertEqual(len(reader), 1 + reader.get_size(left) + reader.get_size(right))
+    self.assertEqual(Node(value=None), TreeReader(dump_tree(Node(value=None))).get_tree())
+    self.assertEqual(incomplete, TreeReader(dump_tree(incomplete)).get_tree())
+    self.assertIsNone(TreeReader(dump_tree(incomplete)).get_opcode(1 + reader.get_size(left)))
+    with self.assertRaises(ValueError):
+      TokenReader(dump_tree(tree))
+
+
+  def test_memory_mapped_files(self):
+    tokens = ExpressionParser(self.EXPRESSION).get_tokens()
+    tree = SyntaxAnalyzer(tokens).get_tree()
+    with tempfile.TemporaryDirectory() as directory:
+      tokens_path, tree_path = os.path.join(directory, 'tokens.bin'), os.path.join(directory, 'tree.bin')
+      write_tokens(tokens_path, tokens)
+      write_tree(tree_path, tree)
+
+      self.assertTupleEqual(tokens, load_tokens(tokens_path))
+      self.assertEqual(tree, load_tree(tree_path))
+      with map_file(tree_path) as buffer:
+        self.assertEqual(tree.left, TreeReader(buffer).get_tree(1))
@@ -0,0 +1,57 @@
+import unittest
+import math
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.parallel_tree.builder import build_parallel_tree
+from expression_parser.evaluator.program import EvaluationException
+from expression_parser.evaluator.compiler import compile_tree, evaluate
+
+
+class TestExpressionParser(unittest.TestCase):
+  BINDINGS = dict(a=1.5, b=-2, c=0.25, d=4)
+
+
+  def test_operators_and_functions(self):
+    cases = (
+      ('a + b * c - d / 2', 1.5 + -2 * 0.25 - 4 / 2),
+      ('-a ^ 2 + +b', (-1.5) ** 2 + -2),
+      ('2 ^ 3 ^ 2', (2 ** 3) ** 2),
+      ('max(a, d) - min(b, c) + pow(d, .5)', 4 - -2 + 2),
+      ('sin(a) * cos(c)', math.sin(1.5) * math.cos(0.25)),
+    )
+    for expression, expected in cases:
+      self.assertAlmostEqual(expected, evaluate(parse(expression), self.BINDINGS), msg=expression)
+    self.assertTrue(0 <= evaluate(parse('rand()'), dict()) < 1)
+
+
+  def test_parallel_tree_values(self):
+    expression = 'a - (b + c) * d / (a - c + 2) - max(a, b) * (c - d)'
+    tree = parse(expression)
+    expected = evaluate(tree, self.BINDINGS)
+
+    self.assertAlmostEqual(expected, evaluate(build_parallel_tree(tree), self.BINDINGS))
+
+
+  def test_compiled_cache_and_bindings(self):
+    compiled = compile_tree(parse('if + None * a'))
+
+    self.assertIs(compiled, compile_tree(parse('if+None*a')))
+    self.assertTupleEqual(('if', 'None', 'a'), compiled.get_variables())
+    self.assertEqual(7, compiled({'if': 1, 'None': 2, 'a': 3}))
+    with self.assertRaises(EvaluationException) as context:
+      compiled(dict(a=1))
+    self.assertEqual('Unbound variable "if"', str(context.exception))
+    with self.assertRaises(EvaluationException):
+      compile_tree(parse(str()))
+
+
+  def test_arithmetic_errors(self):
+    cases = (('a / b', dict(a=1, b=0)), ('(-1) ^ 0.5', dict()), ('10 ^ 400', dict()), ('pow(a, 400)', dict(a=10)))
+    for expression, bindings in cases:
+      with self.assertRaises(EvaluationException, msg=expression):
+        evaluate(parse(expression), bindings)
+    self.assertEqual(0.5, evaluate(parse('a / b'), dict(a=1, b=2)))
+
+
+  def test_deep_expression(self):
+    self.assertEqual(-2, evaluate(parse('-' * 5001 + 'a'), dict(a=2)))
+    self.assertEqual(3000, evaluate(parse(' + '.join(['a'] * 3000)), dict(a=1)))
@@ -0,0 +1,40 @@
+import unittest
+import io
+import json
+from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.analyzer.syntax_analyzer import SyntaxAnalyzer
+from expression_parser.analyzer.tree_nodes import Node
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.tree_output.json_writer import write_json
+
+
+class TestExpressionParser(unittest.TestCase):
+  def __write(self, value, indent: (int | None) = 2) -> str:
+    stream = io.StringIO()
+    write_json(value, stream, indent, chunk_size=16)
+    return stream.getvalue()
+
+
+  def test_same_output_as_to_json(self):
+    tokens = ExpressionParser('max(sin(a), -b ^ 2) / (c + 4.5) - rand()').get_tokens()
+    tree = SyntaxAnalyzer(tokens).get_tree()
+
+    self.assertEqual(tree.to_json(), self.__write(tree))
+    self.assertEqual(Node(value=None).to_json(), self.__write(Node(value=None)))
+    self.assertEqual(json.dumps(tokens, default=lambda o: o.__dict__, indent=2), self.__write(tokens))
+
+
+  def test_compact_output(self):
+    tree = parse('max(sin(a), -b ^ 2) / (c + 4.5)')
+    compact = self.__write(tree, indent=None)
+
+    self.assertNotIn('\n', compact)
+    self.assertNotIn(' ', compact)
+    self.assertEqual(json.loads(tree.to_json()), json.loads(compact))
+
+
+  def test_deep_tree(self):
+    compact = self.__write(parse('-' * 5000 + 'a'), indent=None)
+
+    self.assertTrue(compact.startswith('{"type":"UnaryOperatorNode","value":{"type":"OPERATOR"'))
+    self.assertEqual(5001, compact.count('"value":{'))
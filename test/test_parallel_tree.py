@@ -0,0 +1,133 @@
+import math
+import random
+import unittest
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.analyzer.tree_nodes import UnaryOperatorNode, FunctionNode
+from expression_parser.analyzer.flat_tree import FlatTree
+from expression_parser.evaluator.compiler import evaluate
+from expression_parser.parallel_tree.builder import build_parallel_tree, rebalance_chains, get_parallel_passes
+from expression_parser.parallel_tree.pass_manager import PassManager, count_nodes
+from expression_parser.parallel_tree.optimizer_tools import fold_constants, copy_tree, convert_to_optimized
+from expression_parser.tree_output.str_converter import stringify_tree
+
+
+class TestExpressionParser(unittest.TestCase):
+  def test_constant_folding(self):
+    cases = (
+      ('2 * 3 + 4', '10'),
+      ('pow(2, 10) * a', '1024 * a'),
+      ('7 / 2 * 2 + 1 / 4', '7.25'),
+      ('max(2, -3) - min(1.5, 2) ^ 2', '-0.25'),
+      ('a - (2 - 5) * b', 'a - -3 * b'),
+      ('rand() * (1 + 1)', 'rand() * 2'),
+      ('a + 1 / 0 + (0 - 8) ^ 0.5', 'a + 1 / 0 + -8 ^ 0.5'),
+      ('10 ^ 400 * a', '10 ^ 400 * a'),
+    )
+    for expression, expected in cases:
+      self.assertEqual(expected, stringify_tree(fold_constants(parse(expression))), msg=expression)
+
+    folded = fold_constants(parse('a + 2 * 3'))
+    self.assertEqual(6, folded.right.value.start)
+    self.assertIsInstance(fold_constants(parse('2 - 5')), UnaryOperatorNode)
+    self.assertEqual('a', stringify_tree(build_parallel_tree(parse('a * (2 - 1)'))))
+
+
+  def test_optimized_conversion(self):
+    cases = (
+      ('-(a + -b)', '-(a - b)'),
+      ('1 / (a + -b)', '1 / (a - b)'),
+      ('1 / (a + -b) * c', 'c / (a - b)'),
+      ('c * (1 / (a + -b))', 'c / (a - b)'),
+      ('1 / (a + -b) * (1 / (c + -d))', '1 / ((a - b) * (c - d))'),
+      ('1 / (a * (1 / b)) * c', 'c / (a / b)'),
+      ('-(a + -b) * c', '-((a - b) * c)'),
+    )
+    for expression, expected in cases:
+      self.assertEqual(expected, stringify_tree(convert_to_optimized(parse(expression))), msg=expression)
+
+    self.assertEqual('-(x ^ (a - b))', stringify_tree(build_parallel_tree(parse('-(x ^ (a - b))'))))
+    self.assertEqual('d - cos(a - b)', stringify_tree(build_parallel_tree(parse('-cos(a - b) + d'))))
+
+
+  def test_chains_rebalancing(self):
+    chain = ' + '.join(f'x{i}' for i in range(64))
+    bindings = {f'x{i}': i for i in range(64)} | dict(a=2, b=3)
+    expression = 'a * b * sin(' + chain + ') * (a - b) - b'
+
+    self.assertEqual(7, FlatTree.of(build_parallel_tree(parse(chain))).get_depth())
+    self.assertEqual('a + b + c + d + e', stringify_tree(rebalance_chains(parse('a + b + c + d + e'))))
+    self.assertEqual(10, FlatTree.of(build_parallel_tree(parse(expression))).get_depth())
+    self.assertAlmostEqual(evaluate(parse(expression), bindings), evaluate(build_parallel_tree(parse(expression)), bindings))
+
+
+  def test_weighted_rebalancing(self):
+    unit = build_parallel_tree(parse('sin(a) + b + c + d + e'))
+    weighted = build_parallel_tree(parse('sin(a) + b + c + d + e'), weighted=True)
+
+    self.assertEqual(4, FlatTree.of(unit).get_depth())
+    self.assertEqual(4, FlatTree.of(weighted).get_depth())
+    self.assertIsInstance(weighted.right, FunctionNode)
+    self.assertEqual('b + c + d + e + sin(a)', stringify_tree(weighted))
+
+
+  def test_deep_trees(self):
+    chain = build_parallel_tree(parse(' - '.join(f'x{i} * 1' for i in range(4000))))
+    nested = '(' * 3000 + 'a' + ' * b - 1)' * 3000
+    tree = parse(nested)
+
+    self.assertEqual(13, FlatTree.of(chain).get_depth())
+    self.assertEqual(-3998, evaluate(chain, {f'x{i}': 1 for i in range(4000)}))
+    self.assertEqual(-0.5, evaluate(build_parallel_tree(parse('-' * 5001 + '(a - b) / c')), dict(a=3, b=1, c=4)))
+    self.assertEqual(FlatTree.of(tree).get_depth(), FlatTree.of(copy_tree(tree)).get_depth())
+    self.assertEqual(-2999, evaluate(build_parallel_tree(tree), dict(a=1, b=1)))
+
+
+  def test_pass_manager(self):
+    tree = parse('a * 1 + (b - 0) * (2 + 3) / c')
+    reported = list()
+    manager = PassManager(get_parallel_passes(), callback=reported.append)
+    result = build_parallel_tree(tree, manager=manager)
+    stats = manager.get_stats()
+
+    self.assertEqual(stringify_tree(build_parallel_tree(tree)), stringify_tree(result))
+    self.assertListEqual(list(stats), reported)
+    self.assertListEqual([p.name for p in get_parallel_passes()], [s.name for s in stats])
+    self.assertEqual(count_nodes(tree), stats[0].nodes_before)
+    self.assertEqual(count_nodes(result), stats[-1].nodes_after)
+    self.assertTrue(all(s.seconds >= 0 for s in stats))
+    self.assertTrue(all(s.peak_bytes >= max(s.allocated_bytes, 0) for s in stats))
+    self.assertGreater(stats[0].peak_bytes, 0)
+    self.assertEqual(11, stats[1].nodes_after)
+    self.assertTupleEqual(tuple(), PassManager(get_parallel_passes()).get_stats())
+
+    unoptimized = manager.without('convert_to_optimized', 'fold_constants')
+    self.assertEqual('2 * 3 + -a', stringify_tree(build_parallel_tree(parse('2 * 3 - a'), manager=unoptimized)))
+    self.assertEqual(6, len(unoptimized.get_stats()))
+    self.assertRaises(ValueError, build_parallel_tree, tree, weighted=True, manager=manager)
+    self.assertRaises(ValueError, build_parallel_tree, tree, False, manager=manager)
+
+
+  def test_rebalancing_depth(self):
+    cases = (
+      ('---b / 0 ^ c + 2 * (3 / 2) * c + 2 ^ (b)', 5, 5),
+      ('c ^ (2 * ((a ^ 0.5) / -0.5))', 5, 5),
+      ('(2 + 0.5) / -b + (d * 2 - (a + a)) - b', 4, 5),
+      ('d + 0.5 + (d + d) + -(a ^ 3) + -(c / cos(2))', 4, 5),
+      ('(0.5 + pow((0.5 + 0.5) / max(c, 3) / a, a)) * c', 7, 7),
+      ('-a - b - c - d + e', 4, 5),
+      ('a / b / c / d * e', 4, 4),
+      ('sin(a - b * c - d) * (x - y) / (z - w)', 5, 6),
+    )
+    for expression, optimized, unoptimized in cases:
+      self.assertEqual(optimized, FlatTree.of(build_parallel_tree(parse(expression))).get_depth(), msg=expression)
+      self.assertEqual(unoptimized, FlatTree.of(build_parallel_tree(parse(expression), False)).get_depth(), msg=expression)
+
+    generator = random.Random(5)
+    for _ in range(300):
+      count = generator.randint(1, 64)
+      operators = generator.choice(('+-', '*/'))
+      terms = ''.join(f' {generator.choice(operators)} x{i}' for i in range(1, count))
+      expression = generator.choice(('', '-')) + 'x0' + terms
+      for convert_to_optimized in (True, False):
+        depth = FlatTree.of(build_parallel_tree(parse(expression), convert_to_optimized)).get_depth()
+        self.assertLessEqual(depth, math.ceil(math.log2(count)) + 2, msg=expression)
@@ -1,5 +1,9 @@
 import unittest
+from unittest.mock import patch
+from expression_parser.parser import symbol_table
 from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.parser.expression_scanner import ExpressionScanner
+from expression_parser.parser.token_buffer import TokenBuffer
 from expression_parser.parser.tokens import Token, Operator, TokenType, Signature
 
 
@@ -563,3 +567,58 @@ class TestExpressionParser(unittest.TestCase):
 
     self.assertTupleEqual(expected_tokens, parser.get_tokens())
     self.assertTupleEqual(expected_exceptions, tuple(str(ex) for ex in parser.get_exceptions()))
+
+
+  def test_parse_many(self):
+    expressions = ('a + 2', str(), '8 +', 'sin(x)')
+    results = tuple(ExpressionParser.parse_many(iter(expressions)))
+    self.assertEqual(len(expressions), len(results))
+    for expression, buffer in zip(expressions, results):
+      expected = ExpressionParser(expression)
+      self.assertIsInstance(buffer, TokenBuffer)
+      self.assertEqual(expression, buffer.get_source())
+      self.assertTupleEqual(expected.get_tokens(), tuple(buffer))
+      self.assertTupleEqual(tuple(str(e) for e in expected.get_exceptions()), tuple(str(e) for e in buffer.get_exceptions()))
+
+    buffer = results[0]
+    self.assertListEqual([TokenType.VARIABLE, TokenType.OPERATOR, TokenType.CONSTANT], [buffer.get_type(i) for i in range(len(buffer))])
+    self.assertListEqual([0, 2, 4], [buffer.get_start(i) for i in range(len(buffer))])
+    self.assertListEqual([2], [e.position for e in results[2].get_exceptions()])
+
+
+  def test_max_errors(self):
+    expression = '$ # @ 8 +'
+    parser = ExpressionParser(expression, max_errors=2)
+    expected_exceptions = (
+      'Unknown symbol "$" at position 0',
+      'Unknown symbol "#" at position 2',
+    )
+    self.assertTupleEqual(tuple(), parser.get_tokens())
+    self.assertTupleEqual(expected_exceptions, tuple(str(ex) for ex in parser.get_exceptions()))
+    self.assertEqual(4, len(ExpressionParser(expression).get_exceptions()))
+
+
+  def test_symbol_table(self):
+    parser = ExpressionParser('alpha * 2 + sin(alpha) / 2.50 - beta')
+    symbols = parser.get_symbols()
+    tokens = parser.get_tokens()
+    scanned = ExpressionScanner('alpha + alpha').get_tokens()
+
+    self.assertIs(symbols, ExpressionScanner('beta').get_symbols())
+    self.assertIs(tokens[0].value, tokens[6].value)
+    self.assertIs(tokens[0].value, scanned[2].value)
+    self.assertEqual(symbols.get_id('alpha'), symbol_table.intern_symbol(scanned[0]))
+    self.assertEqual('alpha', symbols.get_symbol(symbols.get_id('alpha')))
+    self.assertEqual(2, symbols.get_number(symbols.get_id('2')))
+    self.assertEqual(2.5, symbols.get_number(symbols.get_id('2.50')))
+    self.assertIsNone(symbols.get_number(symbols.get_id('sin')))
+    self.assertEqual(-1, symbols.get_id('gamma_unused'))
+    self.assertNotIn('gamma_unused', symbols)
+
+
+  def test_numbers_parsed_once(self):
+    with patch.object(symbol_table, 'parse_number', wraps=symbol_table.parse_number) as parse_number:
+      ExpressionParser('7919.25 * x + 7919.25 / 7919.25')
+      ExpressionScanner('7919.25 - 7919.25')
+      self.assertEqual(7919.25, symbol_table.get_number('7919.25'))
+    self.assertEqual(1, sum(call.args == ('7919.25',) for call in parse_number.call_args_list))
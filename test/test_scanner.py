@@ -0,0 +1,63 @@
+import unittest
+import io
+from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.parser.expression_scanner import ExpressionScanner
+from expression_parser.parser.tokens import Token, TokenType
+
+
+EXPRESSIONS = (
+  str(),
+  '(a/(b*c)^45)/-sin(206.6+-(-+(-(val_))^const))',
+  '  sin\t(\n\n26 ) \n  ',
+  '.9 - 2.8 ^ 3. + -.7',
+  ' . ', '8 + .', '*8', '8^', ') - 8', '8 - (',
+  'va riable', '83 234', '83. 234', '83 .234', '. 234', '234 .',
+  '2( 4', '4) (1', 'a) b', 'a) (b', 'a.b', '2.3.4', '2ab', '12\na',
+  ',1', '1,', '(,)', 'max(1,,2)', '+-*/', 'a $ b', 'a$b', '$.,',
+  '*-/ .,+.21-3^ $7 -()4.5fd,)d  *f7p.1,f  (',
+)
+
+
+class TestExpressionParser(unittest.TestCase):
+  def test_same_output_as_parser(self):
+    for expression in EXPRESSIONS:
+      with self.subTest(expression=expression):
+        expected = ExpressionParser(expression)
+        result = ExpressionScanner(expression)
+        expected_exceptions = tuple((str(e), e.symbol, e.position) for e in expected.get_exceptions())
+        result_exceptions = tuple((str(e), e.symbol, e.position) for e in result.get_exceptions())
+        self.assertTupleEqual(expected.get_tokens(), result.get_tokens())
+        self.assertTupleEqual(expected_exceptions, result_exceptions)
+
+
+  def test_runs_scanning(self):
+    scanner = ExpressionScanner('alpha_1 * 20.75')
+    expected = (
+      Token(value='alpha_1', type=TokenType.VARIABLE, start=0, end=6),
+      Token.of('*', TokenType.OPERATOR, 8),
+      Token(value='20.75', type=TokenType.CONSTANT, start=10, end=14),
+    )
+    self.assertTupleEqual(tuple(), scanner.get_exceptions())
+    self.assertTupleEqual(expected, scanner.get_tokens())
+
+
+  def test_stream_chunk_boundaries(self):
+    scanner = ExpressionScanner()
+    for expression in EXPRESSIONS:
+      for chunk_size in (1, 2, 5):
+        with self.subTest(expression=expression, chunk_size=chunk_size):
+          expected = ExpressionParser(expression)
+          tokens = tuple(scanner.scan_stream(io.StringIO(expression), chunk_size))
+          self.assertTupleEqual(expected.get_tokens(), tokens)
+          self.assertTupleEqual(
+            tuple(str(e) for e in expected.get_exceptions()),
+            tuple(str(e) for e in scanner.get_exceptions()),
+          )
+
+
+  def test_stream_yields_completed_tokens(self):
+    stream = io.StringIO('max(alpha, 2)')
+    tokens = ExpressionScanner().scan_stream(stream, chunk_size=4)
+    self.assertEqual(Token(value='max', type=TokenType.FUNCTION, start=0, end=2), next(tokens))
+    self.assertEqual(4, stream.tell())
+
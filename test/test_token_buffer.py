@@ -0,0 +1,57 @@
+import unittest
+from expression_parser.parser.expression_parser import ExpressionParser
+from expression_parser.parser.token_buffer import TokenBuffer
+from expression_parser.parser.tokens import TokenType
+from expression_parser.analyzer.syntax_analyzer import SyntaxAnalyzer
+
+
+class TestExpressionParser(unittest.TestCase):
+  def test_same_tokens_as_parser(self):
+    for expression in ('', 'max(a1, -2.5) ^ sin(x)', 'va riable + a$b', '8 + .'):
+      with self.subTest(expression=expression):
+        expected = ExpressionParser(expression)
+        buffer = TokenBuffer.scan(expression, chunk_size=3)
+        self.assertTupleEqual(expected.get_tokens(), tuple(buffer))
+        self.assertTupleEqual(
+          tuple(str(e) for e in expected.get_exceptions()),
+          tuple(str(e) for e in buffer.get_exceptions()),
+        )
+
+
+  def test_compact_fields(self):
+    buffer = TokenBuffer.scan('alpha * (b - 20)')
+    self.assertEqual(7, len(buffer))
+    self.assertEqual(TokenType.VARIABLE, buffer.get_type(0))
+    self.assertEqual('alpha', buffer.get_value(0))
+    self.assertEqual(14, buffer.get_end(-2))
+    self.assertEqual('20', buffer[-2].value)
+
+
+  def test_syntax_analyzer_input(self):
+    expression = '-(p + 3) + pow(-4 ^ 2, rand())'
+    expected = SyntaxAnalyzer(ExpressionParser(expression).get_tokens()).get_tree()
+    result = SyntaxAnalyzer(TokenBuffer.scan(expression)).get_tree()
+    self.assertEqual(expected, result)
+
+
+  def test_incremental_edit(self):
+    source = 'sin(alpha) + 2.5 * max(b, c) - 7'
+    edits = (
+      (0, 3, 'cos'),
+      (11, 1, '-'),
+      (13, 3, '4'),
+      (len(source), 0, ' ^'),
+      (6, 0, ' x'),
+      (0, len(source), str()),
+    )
+    for offset, deleted, inserted in edits:
+      with self.subTest(offset=offset, deleted=deleted, inserted=inserted):
+        edited = source[:offset] + inserted + source[offset + deleted:]
+        expected = ExpressionParser(edited)
+        result = TokenBuffer.scan(source).edit(offset, deleted, inserted)
+        self.assertEqual(edited, result.get_source())
+        self.assertTupleEqual(expected.get_tokens(), tuple(result))
+        self.assertTupleEqual(
+          tuple(str(e) for e in expected.get_exceptions()),
+          tuple(str(e) for e in result.get_exceptions()),
+        )
@@ -0,0 +1,95 @@
+import unittest
+import importlib.util
+from expression_parser.analyzer.fused_parser import parse
+from expression_parser.parallel_tree.builder import build_parallel_tree
+from expression_parser.evaluator.program import EvaluationException
+from expression_parser.evaluator.compiler import compile_tree
+
+NUMPY_MISSING = importlib.util.find_spec('numpy') is None
+if not NUMPY_MISSING:
+  import numpy as np
+  from expression_parser.evaluator.vectorized import evaluate_vectorized, compile_vectorized
+  from expression_parser.evaluator.buffer_planner import evaluate_chunked, plan_buffers
+  from expression_parser.evaluator.parallel import evaluate_parallel
+
+
+@unittest.skipIf(NUMPY_MISSING, 'numpy is not installed')
+class TestExpressionParser(unittest.TestCase):
+  EXPRESSION = 'max(sin(a), -b ^ 2) / (c + 4.5) - pow(a, 2) * min(b, c) + cos(2)'
+
+
+  def __bindings(self, size: int = 100) -> dict:
+    rng = np.random.default_rng(0)
+    return dict(a=rng.random(size), b=rng.random(size) - 0.5, c=rng.random(size))
+
+
+  def test_same_values_as_compiled(self):
+    bindings = self.__bindings()
+    tree = parse(self.EXPRESSION)
+    compiled = compile_tree(tree)
+    expected = [compiled({k: v[i] for k, v in bindings.items()}) for i in range(100)]
+
+    np.testing.assert_allclose(expected, evaluate_vectorized(tree, bindings))
+    np.testing.assert_allclose(expected, evaluate_vectorized(build_parallel_tree(tree), bindings))
+
+
+  def test_broadcasting_and_randoms(self):
+    bindings = self.__bindings(4)
+    random = evaluate_vectorized(parse('rand() + a * 0'), bindings)
+    same = evaluate_vectorized(parse('a'), bindings)
+
+    np.testing.assert_array_equal([3, 3, 3, 3], evaluate_vectorized(parse('1 + 2 + b * 0'), bindings))
+    np.testing.assert_array_equal([2, 4], evaluate_vectorized(parse('2 * a'), dict(a=[1, 2])))
+    self.assertEqual(5, evaluate_vectorized(parse('2 + 3'), dict()))
+    self.assertTrue(np.all((0 <= random) & (random < 1)))
+    self.assertEqual(4, len(np.unique(random)))
+    self.assertIsNot(bindings['a'], same)
+    self.assertIs(compile_vectorized(parse('a+b')), compile_vectorized(parse('a + b')))
+    with self.assertRaises(EvaluationException):
+      evaluate_vectorized(parse('a + d'), bindings)
+
+
+  def test_arithmetic_errors(self):
+    cases = (('a / b', dict(a=[1, 2], b=[1, 0])), ('(-1) ^ 0.5', dict()), ('10 ^ 400', dict()), ('pow(a, 400)', dict(a=[1, 10])))
+    for expression, bindings in cases:
+      for backend in (evaluate_vectorized, evaluate_chunked):
+        with self.assertRaises(EvaluationException, msg=expression):
+          backend(parse(expression), bindings)
+    with self.assertRaises(EvaluationException):
+      evaluate_parallel(parse('a / b'), dict(a=np.ones(10), b=np.zeros(10)), workers=2, rows_per_task=5)
+    np.testing.assert_array_equal([0.5, 1], evaluate_vectorized(parse('a / b'), dict(a=1, b=[2, 1])))
+
+
+  def test_chunked_evaluation(self):
+    bindings = self.__bindings(1000)
+    tree = build_parallel_tree(parse(self.EXPRESSION))
+    out = np.empty(1000)
+
+    self.assertIs(out, evaluate_chunked(tree, bindings, out, chunk_elements=64))
+    np.testing.assert_allclose(evaluate_vectorized(tree, bindings), out)
+    np.testing.assert_allclose(2 * bindings['a'], evaluate_chunked(parse('a * 2'), bindings, chunk_elements=7))
+    np.testing.assert_array_equal(bindings['b'], evaluate_chunked(parse('b'), bindings))
+    self.assertEqual(5, evaluate_chunked(parse('2 + 3'), dict()))
+
+
+  def test_buffers_reuse(self):
+    balanced = ' - '.join(['(a * b + c * a)'] * 64)
+    chain = ' + '.join(['sin(a)'] * 256)
+
+    self.assertEqual(0, plan_buffers(parse('a + b')).get_buffers_count())
+    self.assertEqual(2, plan_buffers(parse('(a + b) * (c + a)')).get_buffers_count())
+    self.assertLessEqual(plan_buffers(build_parallel_tree(parse(balanced))).get_buffers_count(), 9)
+    self.assertEqual(2, plan_buffers(parse(chain)).get_buffers_count())
+
+
+  def test_parallel_evaluation(self):
+    bindings = self.__bindings(1000) | dict(c=np.float64(0.5))
+    tree = build_parallel_tree(parse(self.EXPRESSION))
+    random = lambda seed: evaluate_parallel(parse('rand() + a * 0'), bindings, workers=2, rows_per_task=300, seed=seed)
+
+    np.testing.assert_allclose(evaluate_vectorized(tree, bindings), evaluate_parallel(tree, bindings, 2, rows_per_task=128))
+    np.testing.assert_array_equal(random(1), random(1))
+    self.assertEqual(1000, len(np.unique(random(1))))
+    self.assertEqual(5, evaluate_parallel(parse('2 + 3'), dict()))
+    with self.assertRaises(EvaluationException):
+      evaluate_parallel(parse('a + d'), bindings)